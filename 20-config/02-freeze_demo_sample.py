@@ -0,0 +1,51 @@
+"""
+Freezes the Demo Dataset page's sample orders into a Parquet snapshot.
+
+The Demo Dataset page previews a few rows of sales_table. Reading them from
+this snapshot saves a database round-trip and the row-to-DataFrame conversion
+on every cold start. Re-run this script after regenerating the database with
+01-data_generator.py so the snapshot matches it.
+"""
+
+import os
+import sys
+
+SAMPLE_ROWS = 10
+
+
+def freeze_sample(snapshot_path, n=SAMPLE_ROWS):
+    """
+    Reads the first n orders from the database and writes them to Parquet.
+
+    Args:
+        snapshot_path (str): Destination Parquet file.
+        n (int): Number of sample rows to store.
+
+    Returns:
+        pd.DataFrame: The frozen sample.
+    """
+    from schema import get_schema
+
+    sample = get_schema().get_sample_dataframe(n)
+    if sample.empty:
+        raise RuntimeError("No sample data returned; is the database populated?")
+
+    sample.to_parquet(snapshot_path, compression="zstd", index=False)
+    return sample
+
+
+def main():
+    """
+    Main function to write the sample snapshot into 70-data/.
+    """
+    current_dir = os.path.dirname(__file__)
+    parent_dir = os.path.dirname(current_dir)
+    sys.path.append(os.path.join(parent_dir, "30-database"))
+
+    snapshot_path = os.path.join(parent_dir, "70-data", "demo_sample.parquet")
+    sample = freeze_sample(snapshot_path)
+    print(f"Wrote {len(sample)} sample orders to {snapshot_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Conversion of query results into pandas DataFrames.
+
+Shared by the story generator, the chart generator and the AI Chatbot page, so a
+result's rows are turned into a DataFrame the same way everywhere.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def numeric_matrix(data: List[tuple]) -> Optional[np.ndarray]:
+    """
+    Convert row tuples whose values are all ints, or all floats, to a 2-D NumPy array.
+
+    Mixed int/float rows are rejected: a shared array would turn the int columns
+    into float64, losing their dtype and the precision of large IDs.
+
+    Args:
+        data: List of tuples containing query results
+
+    Returns:
+        Array of shape (rows, columns), or None if the rows don't share one numeric type
+    """
+    if not data:
+        return None
+    value_types = set(map(type, data[0]))
+    if value_types == {int}:
+        expected_kinds = 'iu'
+    elif value_types == {float}:
+        expected_kinds = 'f'
+    else:
+        return None
+    try:
+        arr = np.asarray(data)
+    except ValueError:
+        # Ragged rows
+        return None
+    # Later rows may still hold other types (a float among ints, None, huge ints)
+    if arr.ndim != 2 or arr.dtype.kind not in expected_kinds:
+        return None
+    return arr
+
+
+def rows_to_dataframe(data: List[tuple], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Build a DataFrame from query result rows.
+
+    Results that are all ints, or all floats, are converted once to a
+    Fortran-ordered array, which pandas stores without copying and hands back
+    from to_numpy() unchanged. Other rows of equal width are transposed with
+    zip(*data), so pandas infers one dtype per column instead of parsing every
+    row. Ragged rows go through the row-wise constructor, which pads short rows
+    with missing values instead of dropping cells. Columns are keyed by position first so duplicate names from
+    SQL results are preserved.
+
+    Args:
+        data: List of tuples containing query results
+        columns: Column names, one per tuple element; None names them column_1, column_2, ...
+
+    Returns:
+        pandas DataFrame with the given column names
+
+    Raises:
+        ValueError: If the number of column names doesn't match the widest row
+    """
+    if not data:
+        return pd.DataFrame(columns=columns)
+
+    arr = numeric_matrix(data)
+    width = len(data[0])
+    if arr is not None:
+        # Column-major, so each column is a contiguous slice of one buffer
+        df = pd.DataFrame(np.asfortranarray(arr), copy=False)
+    elif all(len(row) == width for row in data):
+        df = pd.DataFrame({i: list(values) for i, values in enumerate(zip(*data))})
+    else:
+        df = pd.DataFrame(list(data))
+
+    if columns is None:
+        columns = [f'column_{i + 1}' for i in range(len(df.columns))]
+    df.columns = list(columns)
+    return df
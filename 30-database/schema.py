@@ -7,6 +7,7 @@ to help LLM agents understand the database structure and generate accurate SQL q
 
 from typing import Dict, List, Any
 from dataclasses import dataclass
+import pandas as pd
 from connection import get_database
 
 @dataclass
@@ -239,6 +240,24 @@ SAMPLE QUERIES:
         except Exception as e:
             return []
     
+    def get_sample_dataframe(self, limit: int = 10) -> pd.DataFrame:
+        """
+        Get sample data from the database as a DataFrame.
+        
+        DuckDB builds the DataFrame column by column, without the per-row
+        dictionaries of get_sample_data.
+        
+        Args:
+            limit: Number of sample rows to return
+            
+        Returns:
+            pandas DataFrame containing sample data, empty on error
+        """
+        try:
+            return self.db.execute_query_df(f"SELECT * FROM sales_table LIMIT {int(limit)}")
+        except Exception as e:
+            return pd.DataFrame()
+    
     def get_data_quality_info(self) -> Dict[str, Any]:
         """
         Get data quality information.
@@ -38,6 +38,8 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 DB_PATH = '30-database/my_ecommerce_db.duckdb'
 MAX_QUERY_ROWS = int(os.getenv('MAX_QUERY_ROWS', '10000'))
 QUERY_TIMEOUT = int(os.getenv('QUERY_TIMEOUT', '30'))
+# Routes SQL requests to the same OpenAI prompt cache, which holds the static system prompt
+PROMPT_CACHE_KEY = 'data-story-ai-sql'
 
 if not OPENAI_API_KEY:
     logger.error("OPENAI_API_KEY not found in environment variables")
@@ -65,6 +67,8 @@ class SQLQueryGenerator:
         self.schema = get_schema()
         self.llm = self._initialize_llm()
         self.schema_context = self.schema.get_schema_context()
+        # Built once so every request starts with byte-identical tokens (provider prefix caching)
+        self.system_prompt = self._create_system_prompt()
 
     def _initialize_llm(self) -> ChatOpenAI:
         """Initialize the OpenAI LLM."""
@@ -73,15 +77,16 @@ class SQLQueryGenerator:
                 model="gpt-4.1-nano-2025-04-14",
                 temperature=0.8,
                 openai_api_key=OPENAI_API_KEY,
-                max_tokens=2000
+                max_tokens=2000,
+                extra_body={"prompt_cache_key": PROMPT_CACHE_KEY}
             )
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}")
             raise
 
-    def _create_sql_prompt(self, question: str) -> List[Dict[str, str]]:
-        """Create a structured prompt for SQL generation."""
-        system_prompt = f"""
+    def _create_system_prompt(self) -> str:
+        """Create the static system prompt: instructions plus schema context."""
+        return f"""
 You are an expert SQL analyst for an e-commerce database. Your task is to generate accurate SQL queries based on natural language questions.
 
 {self.schema_context}
@@ -97,6 +102,7 @@ IMPORTANT RULES:
 8. Use appropriate aggregation functions (SUM, COUNT, AVG, etc.)
 9. For price calculations, multiply product_price by quantity_ordered
 10. Consider both product_category and product_subcategory for detailed analysis
+11. Do all aggregation, ranking and statistics in SQL (GROUP BY, window functions) and return only the reduced rows, never raw orders for the application to aggregate
 
 DUCKDB-SPECIFIC COMPATIBILITY:
 - For percentiles, use QUANTILE_CONT(value, percentile) instead of APPROXIMATE_PERCENTILE
@@ -118,6 +124,8 @@ SAMPLE QUERIES:
 - State analysis: SELECT shipping_state, COUNT(*) as orders, AVG(product_price * quantity_ordered) as avg_order_value FROM sales_table GROUP BY shipping_state ORDER BY orders DESC;
 """
 
+    def _create_sql_prompt(self, question: str) -> List[Dict[str, str]]:
+        """Create a structured prompt for SQL generation."""
         user_prompt = f"""
 Generate a SQL query for this question: {question}
 
@@ -125,7 +133,7 @@ Return only the SQL query, no additional text or formatting.
 """
 
         return [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": user_prompt}
         ]
 
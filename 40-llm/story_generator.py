@@ -7,14 +7,23 @@ providing context and actionable recommendations.
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Generator
 from dataclasses import dataclass
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 import pandas as pd
 import json
+import re
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
+# Add database module to path, once
+database_path = str(Path(__file__).parent.parent / "30-database")
+if database_path not in sys.path:
+    sys.path.append(database_path)
+from frames import rows_to_dataframe
+
 # Environment variables hardcoded for Streamlit deployment
 load_dotenv()
 
@@ -29,6 +38,100 @@ if not OPENAI_API_KEY:
     logger.error("OPENAI_API_KEY not found in environment variables")
     raise ValueError("OPENAI_API_KEY is required")
 
+# Routes story requests to the same OpenAI prompt cache, which holds the static system prompt
+PROMPT_CACHE_KEY = 'data-story-ai-story'
+
+# Separator between a key and its string value: whitespace, colon, whitespace, quote
+_VALUE_START = re.compile(r'\s*:\s*"')
+_PARTIAL_VALUE_START = re.compile(r'\s*(:\s*)?')
+
+class _JSONStringReader:
+    """
+    Read one top-level string value out of JSON that arrives in chunks.
+
+    Each chunk is scanned once: before the value starts, only the text that could
+    still be the start of the key is kept; inside the value, only an escape
+    sequence cut off at the end of a chunk is held back for the next one.
+    """
+
+    def __init__(self, key: str):
+        """
+        Args:
+            key: Top-level key whose string value to read
+        """
+        self._token = '"%s"' % key
+        self._head = ""
+        self._pending = ""
+        self._started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next chunk of JSON text.
+
+        Args:
+            chunk: JSON text received since the last call
+
+        Returns:
+            The newly decoded part of the value, or an empty string
+        """
+        if self.done:
+            return ""
+        if not self._started:
+            chunk = self._find_value_start(chunk)
+            if not self._started:
+                return ""
+
+        raw = self._pending + chunk
+        self._pending = ""
+        i = 0
+        while i < len(raw):
+            char = raw[i]
+            if char == '"':
+                self.done = True
+                raw = raw[:i]
+                break
+            if char == '\\':
+                # A \uXXXX escape is six characters, any other escape two
+                length = 6 if raw[i + 1:i + 2] == 'u' else 2
+                if i + length > len(raw):
+                    raw, self._pending = raw[:i], raw[i:]
+                    break
+                i += length
+                continue
+            i += 1
+
+        try:
+            decoded = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return raw
+        if decoded and not self.done and '\ud800' <= decoded[-1] <= '\udbff':
+            # Hold back a high surrogate until its pair arrives
+            self._pending = raw[-6:] + self._pending
+            decoded = decoded[:-1]
+        return decoded
+
+    def _find_value_start(self, chunk: str) -> str:
+        """Look for the key in the text so far; returns the text after the value's opening quote."""
+        head = self._head + chunk
+        start = 0
+        while True:
+            found = head.find(self._token, start)
+            if found == -1:
+                # Keep only a tail that could still be the start of the key
+                self._head = head[max(start, len(head) - len(self._token) + 1):]
+                return ""
+            match = _VALUE_START.match(head, found + len(self._token))
+            if match:
+                self._started = True
+                self._head = ""
+                return head[match.end():]
+            if _PARTIAL_VALUE_START.fullmatch(head, found + len(self._token)):
+                # The colon or opening quote has not arrived yet
+                self._head = head[found:]
+                return ""
+            start = found + 1
+
 @dataclass
 class StoryContent:
     """Structure for generated story content."""
@@ -38,6 +141,8 @@ class StoryContent:
     recommendations: List[str]
     visualization_suggestions: List[Dict[str, str]]
     follow_up_questions: List[str]
+    # False for the placeholder story returned when generation fails
+    success: bool = True
 
 class StoryGenerator:
     """
@@ -76,17 +181,12 @@ class StoryGenerator:
                     # Truncate extra column names
                     columns = columns[:actual_cols]
 
-            return pd.DataFrame(data, columns=columns)
+            return rows_to_dataframe(data, columns)
 
         except Exception as e:
             logger.error(f"Error creating safe DataFrame in story generator: {e}")
-            # Ultimate fallback: create generic DataFrame
-            if data and len(data) > 0:
-                actual_cols = len(data[0])
-                fallback_columns = [f'column_{i+1}' for i in range(actual_cols)]
-                return pd.DataFrame(data, columns=fallback_columns)
-            else:
-                return pd.DataFrame()
+            # Ultimate fallback: generic column names for however wide the rows are
+            return rows_to_dataframe(data) if data else pd.DataFrame()
 
     def _initialize_llm(self) -> ChatOpenAI:
         """Initialize the OpenAI LLM."""
@@ -95,7 +195,10 @@ class StoryGenerator:
                 model="gpt-4.1-nano-2025-04-14",
                 temperature=0.8,
                 openai_api_key=OPENAI_API_KEY,
-                max_tokens=10000
+                max_tokens=10000,
+                # JSON mode: the whole story comes back as one parseable object
+                model_kwargs={"response_format": {"type": "json_object"}},
+                extra_body={"prompt_cache_key": PROMPT_CACHE_KEY}
             )
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}")
@@ -137,6 +240,45 @@ class StoryGenerator:
             logger.error(f"Error generating story: {e}")
             return self._create_error_story(str(e))
 
+    def generate_story_stream(self, question: str, query: str, data: List[tuple],
+                              columns: List[str]) -> Generator[str, None, StoryContent]:
+        """
+        Generate a business story, streaming the executive summary as it is written.
+
+        Yields pieces of the executive summary text as the model produces them;
+        the complete story is the generator's return value.
+
+        Args:
+            question: Original business question
+            query: SQL query that was executed
+            data: Query results
+            columns: Column names
+
+        Returns:
+            StoryContent with comprehensive analysis
+        """
+        try:
+            df = self._create_safe_dataframe(data, columns)
+            context = self._create_analysis_context(question, query, df, columns)
+            story_prompt = self._create_story_prompt(context)
+
+            parts = []
+            summary = _JSONStringReader("executive_summary")
+            for chunk in self.llm.stream([
+                SystemMessage(content=story_prompt["system"]),
+                HumanMessage(content=story_prompt["user"])
+            ]):
+                parts.append(chunk.content)
+                piece = summary.feed(chunk.content)
+                if piece:
+                    yield piece
+
+            return self._parse_story_response("".join(parts))
+
+        except Exception as e:
+            logger.error(f"Error generating story: {e}")
+            return self._create_error_story(str(e))
+
     def _create_analysis_context(self, question: str, query: str, df: pd.DataFrame, columns: List[str]) -> Dict[str, Any]:
         """Create context for story generation."""
         context = {
@@ -316,7 +458,8 @@ Please provide a comprehensive business analysis in JSON format.
                 "Is the data format correct?",
                 "Are all required fields present?",
                 "Should we simplify the analysis?"
-            ]
+            ],
+            success=False
         )
 
     def generate_quick_summary(self, data: List[tuple], columns: List[str]) -> str:
@@ -334,7 +477,7 @@ Please provide a comprehensive business analysis in JSON format.
             if not data:
                 return "No data found for the given query."
 
-            df = pd.DataFrame(data, columns=columns)
+            df = rows_to_dataframe(data, columns)
 
             summary = f"Query returned {len(df)} rows with {len(columns)} columns. "
 
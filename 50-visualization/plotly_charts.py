@@ -3,37 +3,304 @@ Plotly chart generation utilities for data visualization.
 
 This module provides functions to create various types of charts and visualizations
 using Plotly based on SQL query results.
+
+Figures are never rasterized on the server. Every ``create_*`` method returns a
+``go.Figure`` whose JSON spec is shipped to the browser and rendered client-side by
+Plotly.js (``Plotly.newPlot(div, data, layout, config)``). st.plotly_chart serializes
+the spec with plotly.io.to_json, which uses orjson when it is installed.
 """
 
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 from typing import List, Dict, Any, Optional, Union
 import logging
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from enum import Enum
+from functools import lru_cache
 import numpy as np
+import sys
+from pathlib import Path
+
+# Add database module to path, once
+database_path = str(Path(__file__).parent.parent / "30-database")
+if database_path not in sys.path:
+    sys.path.append(database_path)
+from frames import numeric_matrix, rows_to_dataframe
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Trace colour cycle shared by all charts
+DEFAULT_COLORS = (
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+    '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
+)
+
+
+class ChartType(Enum):
+    """Chart types chosen from the shape of a result set."""
+    BAR = "bar"
+    LINE = "line"
+    PIE = "pie"
+    SCATTER = "scatter"
+    HISTOGRAM = "histogram"
+    HEATMAP = "heatmap"
+
+
+@lru_cache(maxsize=512)
+def _pretty(name: str) -> str:
+    """Turn a column name like 'total_revenue' into an axis label like 'Total Revenue'."""
+    return name.replace('_', ' ').title()
+
+
+def _as_columns(data: List[tuple]) -> list:
+    """
+    Transpose row tuples into per-column sequences without pandas.
+    
+    All-numeric rows go through NumPy and come back as contiguous 1-D arrays;
+    anything else (strings, dates, None) falls back to plain tuples.
+    
+    Args:
+        data: List of tuples containing query results
+        
+    Returns:
+        One sequence per column
+    """
+    arr = numeric_matrix(data)
+    if arr is not None:
+        # Copy once into column-major rows so each column is a contiguous buffer
+        return list(np.ascontiguousarray(arr.T))
+    return list(zip(*data))
+
+
+def _column_kind(values: pd.Series) -> str:
+    """Classify a column as 'numeric', 'categorical' or 'other'."""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return 'numeric'
+    if pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+        return 'categorical'
+    return 'other'
+
+
+# Point count above which line/scatter charts switch to WebGL traces
+_WEBGL_MIN_POINTS = 1000
+
+
+def _add_xy_trace(fig: go.Figure, xs, ys, webgl: bool = False, **trace_kwargs) -> None:
+    """
+    Add a line/scatter trace, using WebGL for large inputs.
+    
+    Args:
+        fig: Figure to add the trace to
+        xs: x values
+        ys: y values
+        webgl: Always use a WebGL trace, whatever the input size
+        **trace_kwargs: Trace properties
+    """
+    trace_cls = go.Scattergl if webgl or len(xs) > _WEBGL_MIN_POINTS else go.Scatter
+    fig.add_trace(trace_cls(x=xs, y=ys, _validate=False, **trace_kwargs))
+
+
+# Dashboard panel chart_type -> (trace class, x property, y property, fixed properties)
+_PANEL_TRACES = {
+    'bar': (go.Bar, 'x', 'y', {}),
+    'line': (go.Scatter, 'x', 'y', {'mode': 'lines+markers'}),
+    'scatter': (go.Scatter, 'x', 'y', {'mode': 'markers'}),
+    'pie': (go.Pie, 'labels', 'values', {}),
+}
+
+
+@lru_cache(maxsize=32)
+def _dashboard_skeleton(rows: int, cols: int, subplot_titles: tuple) -> go.Figure:
+    """
+    Build an empty subplot grid for a dashboard.
+    
+    Cached per shape and titles; callers must copy it with go.Figure(skeleton)
+    before adding traces. The copy keeps the subplot grid reference, so
+    add_trace(row=..., col=...) still works on it.
+    
+    Args:
+        rows: Number of subplot rows
+        cols: Number of subplot columns
+        subplot_titles: Panel titles in row-major order
+        
+    Returns:
+        Empty Plotly Figure with the subplot grid
+    """
+    return make_subplots(rows=rows, cols=cols, subplot_titles=subplot_titles)
+
+
+# Layout shared by all error charts; the annotation text is filled in per message
+_ERROR_TEMPLATE = {
+    "data": [],
+    "layout": {
+        "title": {"text": "Chart Generation Error"},
+        "xaxis": {"visible": False},
+        "yaxis": {"visible": False},
+        "annotations": [{
+            "xref": "paper", "yref": "paper",
+            "x": 0.5, "y": 0.5,
+            "showarrow": False,
+            "font": {"size": 16, "color": "red"}
+        }]
+    }
+}
+
+
+@lru_cache(maxsize=64)
+def _error_figure_spec(error_message: str) -> dict:
+    """Build the error chart's plain spec for a message once; treat it as read-only."""
+    spec = copy.deepcopy(_ERROR_TEMPLATE)
+    spec["layout"]["annotations"][0]["text"] = f"❌ {error_message}"
+    return spec
+
+
+def _error_figure(error_message: str) -> go.Figure:
+    """
+    Build a fresh error chart from the cached spec, safe for the caller to mutate.
+    
+    The spec is known to be valid, so validation is skipped; plotly copies its
+    values into the new figure, leaving the cached dict untouched.
+    """
+    return go.Figure(_error_figure_spec(error_message), _validate=False)
+
+
+# Largest number of categories still shown as a pie chart
+_PIE_MAX_CATEGORIES = 8
+
+
+@lru_cache(maxsize=256)
+def _classify_shape(first_name: str, kinds: tuple) -> ChartType:
+    """
+    Pick a chart type from the first column name and the column kinds.
+    
+    Pure in its arguments, so repeated result shapes (e.g. dashboard rebuilds)
+    are answered from the cache. PIE means "pie if the categories are few";
+    the cardinality check depends on the values and is left to the caller.
+    
+    Args:
+        first_name: Lower-cased name of the first column
+        kinds: Column kinds from _column_kind, one per column
+        
+    Returns:
+        ChartType best suited to the shape
+    """
+    n_cols = len(kinds)
+    
+    if n_cols == 1:
+        return ChartType.HISTOGRAM
+    
+    if n_cols == 2:
+        if kinds == ('categorical', 'numeric'):
+            return ChartType.PIE
+        if kinds == ('numeric', 'numeric'):
+            return ChartType.SCATTER
+        if 'date' in first_name or 'time' in first_name:
+            return ChartType.LINE
+        return ChartType.BAR
+    
+    if n_cols >= 3 and kinds[:3] == ('categorical', 'categorical', 'numeric'):
+        return ChartType.HEATMAP
+    
+    return ChartType.BAR
+
+
+def _has_few_distinct(values: pd.Series, limit: int) -> bool:
+    """
+    Return True if values hold at most `limit` distinct entries.
+    
+    Scans geometrically growing slices with the vectorised Series.unique(), so a
+    high-cardinality column is rejected after its first few hundred rows while a
+    low-cardinality one costs about the same as a single nunique().
+    
+    Args:
+        values: Column to inspect
+        limit: Largest acceptable number of distinct values
+        
+    Returns:
+        True if the column has at most `limit` distinct values
+    """
+    seen = set()
+    start, size = 0, 256
+    while start < len(values):
+        seen.update(values.iloc[start:start + size].unique())
+        if len(seen) > limit:
+            return False
+        start += size
+        size *= 4
+    return True
+
+
+def _classify(df: pd.DataFrame) -> ChartType:
+    """
+    Pick a chart type from column count, column kinds and category cardinality.
+    
+    Args:
+        df: DataFrame built from query results
+        
+    Returns:
+        ChartType best suited to the data
+    """
+    if len(df.columns) == 0:
+        return ChartType.BAR
+    
+    kinds = tuple(_column_kind(df.iloc[:, i]) for i in range(min(len(df.columns), 3)))
+    if len(df.columns) > 3:
+        # Only the first three columns drive the choice; keep the arity for the cache key
+        kinds += ('other',) * (len(df.columns) - 3)
+    chart_type = _classify_shape(str(df.columns[0]).lower(), kinds)
+    
+    # Few categories read well as a pie chart
+    if chart_type is ChartType.PIE and not _has_few_distinct(df.iloc[:, 0], _PIE_MAX_CATEGORIES):
+        return ChartType.BAR
+    return chart_type
+
+
 class PlotlyChartGenerator:
     """
     Generates Plotly charts from SQL query results.
     """
     
+    # Question keywords that steer auto_generate_chart towards specialised charts
+    _STATISTICAL_KEYWORDS = ('standard deviation', 'std dev', 'variance', 'coefficient', 'percentile',
+                             'quartile', 'distribution', 'outlier', 'correlation', 'volatility')
+    _STATISTICAL_COLUMN_MARKERS = ('std', 'deviation', 'variance', 'coefficient')
+    _CONVERSION_KEYWORDS = ('conversion', 'funnel', 'pipeline', 'flow')
+    _BREAKDOWN_KEYWORDS = ('breakdown', 'waterfall', 'contribution', 'decomposition')
+    
+    __slots__ = ('default_colors', 'chart_config', '_dispatch')
+    
+    # Chart types accepted by create_chart_from_columns
+    COLUMN_CHART_TYPES = ('bar', 'line', 'pie', 'scatter', 'histogram', 'heatmap', 'box',
+                          'violin', 'funnel', 'waterfall', 'statistical_summary')
+    
+    # Dashboard (rows, cols) per number of panels
+    _LAYOUTS = {1: (1, 1), 2: (1, 2), 3: (2, 2), 4: (2, 2), 5: (3, 2), 6: (3, 2)}
+    
     def __init__(self):
         """Initialize the chart generator."""
-        self.default_colors = [
-            '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
-            '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
-        ]
+        self.default_colors = DEFAULT_COLORS
         self.chart_config = {
             'displayModeBar': True,
             'displaylogo': False,
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
         }
+        # Chart builder per question intent or ChartType; unknown keys fall back to a bar chart
+        self._dispatch = {
+            'statistical_summary': self._create_statistical_summary_from_df,
+            'percentile': self._create_box_from_df,
+            'statistical': self._create_violin_from_df,
+            'conversion': self._create_funnel_from_df,
+            'breakdown': self._create_waterfall_from_df,
+            ChartType.HISTOGRAM: self._create_histogram_from_df,
+            ChartType.PIE: self._create_pie_from_df,
+            ChartType.BAR: self._create_bar_from_df,
+            ChartType.SCATTER: self._create_scatter_from_df,
+            ChartType.LINE: self._create_line_from_df,
+            ChartType.HEATMAP: self._create_heatmap_from_df,
+        }
     
     def _create_safe_dataframe(self, data: List[tuple], columns: List[str]) -> pd.DataFrame:
         """
@@ -54,7 +321,7 @@ class PlotlyChartGenerator:
             actual_cols = len(data[0])
             
             if len(columns) != actual_cols:
-                logger.warning(f"Column mismatch: expected {len(columns)}, got {actual_cols}. Auto-fixing...")
+                logger.warning("Column mismatch: expected %d, got %d. Auto-fixing...", len(columns), actual_cols)
                 
                 if len(columns) < actual_cols:
                     # Add missing column names
@@ -63,19 +330,14 @@ class PlotlyChartGenerator:
                     # Truncate extra column names  
                     columns = columns[:actual_cols]
             
-            return pd.DataFrame(data, columns=columns)
+            return rows_to_dataframe(data, columns)
             
         except Exception as e:
-            logger.error(f"Error creating safe DataFrame: {e}")
-            # Ultimate fallback: create generic DataFrame
-            if data and len(data) > 0:
-                actual_cols = len(data[0])
-                fallback_columns = [f'column_{i+1}' for i in range(actual_cols)]
-                return pd.DataFrame(data, columns=fallback_columns)
-            else:
-                return pd.DataFrame()
+            logger.error("Error creating safe DataFrame: %s", e)
+            # Ultimate fallback: generic column names for however wide the rows are
+            return rows_to_dataframe(data) if data else pd.DataFrame()
     
-    def create_bar_chart(self, data: List[tuple], columns: List[str], title: str = "Bar Chart") -> go.Figure:
+    def create_bar_chart(self, data: List[tuple], columns: List[str], title: str = "Bar Chart", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a bar chart from query results.
         
@@ -83,39 +345,47 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating bar chart: %s", e)
+            return self._create_error_chart(f"Error creating bar chart: {e}")
+        return self._create_bar_from_df(df, title)
+    
+    def _create_bar_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a bar chart from the first two columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Bar chart requires at least 2 columns")
             
-            x_col = df.columns[0]
-            y_col = df.columns[1]
+            x_col, y_col = df.columns[0], df.columns[1]
             
-            fig = px.bar(
-                df, 
-                x=x_col, 
-                y=y_col,
-                title=title,
-                color_discrete_sequence=self.default_colors
-            )
+            fig = go.Figure(go.Bar(
+                x=df.iloc[:, 0],
+                y=df.iloc[:, 1],
+                marker_color=DEFAULT_COLORS[0],
+                _validate=False
+            ))
             
             fig.update_layout(
-                xaxis_title=x_col.replace('_', ' ').title(),
-                yaxis_title=y_col.replace('_', ' ').title(),
+                title=title,
+                xaxis_title=_pretty(x_col),
+                yaxis_title=_pretty(y_col),
                 showlegend=False
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating bar chart: {e}")
+            logger.error("Error creating bar chart: %s", e)
             return self._create_error_chart(f"Error creating bar chart: {e}")
     
-    def create_line_chart(self, data: List[tuple], columns: List[str], title: str = "Line Chart") -> go.Figure:
+    def create_line_chart(self, data: List[tuple], columns: List[str], title: str = "Line Chart", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a line chart from query results.
         
@@ -123,38 +393,42 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating line chart: %s", e)
+            return self._create_error_chart(f"Error creating line chart: {e}")
+        return self._create_line_from_df(df, title)
+    
+    def _create_line_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a line chart from the first two columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Line chart requires at least 2 columns")
             
-            x_col = df.columns[0]
-            y_col = df.columns[1]
+            x_col, y_col = df.columns[0], df.columns[1]
             
-            fig = px.line(
-                df, 
-                x=x_col, 
-                y=y_col,
-                title=title,
-                markers=True
-            )
+            fig = go.Figure()
+            _add_xy_trace(fig, df.iloc[:, 0], df.iloc[:, 1], mode='lines+markers')
             
             fig.update_layout(
-                xaxis_title=x_col.replace('_', ' ').title(),
-                yaxis_title=y_col.replace('_', ' ').title()
+                title=title,
+                xaxis_title=_pretty(x_col),
+                yaxis_title=_pretty(y_col)
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating line chart: {e}")
+            logger.error("Error creating line chart: %s", e)
             return self._create_error_chart(f"Error creating line chart: {e}")
     
-    def create_pie_chart(self, data: List[tuple], columns: List[str], title: str = "Pie Chart") -> go.Figure:
+    def create_pie_chart(self, data: List[tuple], columns: List[str], title: str = "Pie Chart", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a pie chart from query results.
         
@@ -162,35 +436,44 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating pie chart: %s", e)
+            return self._create_error_chart(f"Error creating pie chart: {e}")
+        return self._create_pie_from_df(df, title)
+    
+    def _create_pie_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a pie chart from the first two columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Pie chart requires at least 2 columns")
             
-            names_col = df.columns[0]
-            values_col = df.columns[1]
+            colors = [DEFAULT_COLORS[i % len(DEFAULT_COLORS)] for i in range(len(df))]
             
-            fig = px.pie(
-                df, 
-                names=names_col, 
-                values=values_col,
-                title=title,
-                color_discrete_sequence=self.default_colors
-            )
+            fig = go.Figure(go.Pie(
+                labels=df.iloc[:, 0],
+                values=df.iloc[:, 1],
+                marker=dict(colors=colors),
+                textposition='inside',
+                textinfo='percent+label',
+                _validate=False
+            ))
             
-            fig.update_traces(textposition='inside', textinfo='percent+label')
+            fig.update_layout(title=title)
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating pie chart: {e}")
+            logger.error("Error creating pie chart: %s", e)
             return self._create_error_chart(f"Error creating pie chart: {e}")
     
-    def create_scatter_plot(self, data: List[tuple], columns: List[str], title: str = "Scatter Plot") -> go.Figure:
+    def create_scatter_plot(self, data: List[tuple], columns: List[str], title: str = "Scatter Plot", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a scatter plot from query results.
         
@@ -198,42 +481,65 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating scatter plot: %s", e)
+            return self._create_error_chart(f"Error creating scatter plot: {e}")
+        return self._create_scatter_from_df(df, title)
+    
+    def _create_scatter_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a scatter plot from a prepared DataFrame, colouring by the third column if present."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Scatter plot requires at least 2 columns")
             
-            x_col = df.columns[0]
-            y_col = df.columns[1]
+            x_col, y_col = df.columns[0], df.columns[1]
+            xs, ys = df.iloc[:, 0], df.iloc[:, 1]
             
-            # Use third column for color if available
-            color_col = df.columns[2] if len(df.columns) > 2 else None
+            fig = go.Figure()
             
-            fig = px.scatter(
-                df, 
-                x=x_col, 
-                y=y_col,
-                color=color_col,
-                title=title,
-                color_discrete_sequence=self.default_colors
-            )
+            # Use third column for color if available
+            if len(df.columns) > 2:
+                color_col = df.columns[2]
+                color_values = df.iloc[:, 2]
+                if pd.api.types.is_numeric_dtype(color_values):
+                    # Continuous color scale for numeric values
+                    colorbar = dict(showscale=True, colorbar=dict(title=dict(text=color_col)))
+                    _add_xy_trace(fig, xs, ys, webgl=True, mode='markers', marker=dict(color=color_values, **colorbar))
+                else:
+                    # One trace per category, like a discrete legend
+                    for i, category in enumerate(pd.unique(color_values)):
+                        mask = (color_values == category).to_numpy()
+                        _add_xy_trace(
+                            fig, xs[mask], ys[mask],
+                            webgl=True,
+                            mode='markers',
+                            name=str(category),
+                            marker_color=DEFAULT_COLORS[i % len(DEFAULT_COLORS)]
+                        )
+                    fig.update_layout(legend_title_text=color_col)
+            else:
+                _add_xy_trace(fig, xs, ys, webgl=True, mode='markers', marker_color=DEFAULT_COLORS[0])
             
             fig.update_layout(
-                xaxis_title=x_col.replace('_', ' ').title(),
-                yaxis_title=y_col.replace('_', ' ').title()
+                title=title,
+                xaxis_title=_pretty(x_col),
+                yaxis_title=_pretty(y_col)
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating scatter plot: {e}")
+            logger.error("Error creating scatter plot: %s", e)
             return self._create_error_chart(f"Error creating scatter plot: {e}")
     
-    def create_histogram(self, data: List[tuple], columns: List[str], title: str = "Histogram") -> go.Figure:
+    def create_histogram(self, data: List[tuple], columns: List[str], title: str = "Histogram", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a histogram from query results.
         
@@ -241,36 +547,45 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = pd.DataFrame(data, columns=columns)
-            
-            if len(columns) < 1:
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating histogram: %s", e)
+            return self._create_error_chart(f"Error creating histogram: {e}")
+        return self._create_histogram_from_df(df, title)
+    
+    def _create_histogram_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a histogram of the first column of a prepared DataFrame."""
+        try:
+            if len(df.columns) < 1:
                 raise ValueError("Histogram requires at least 1 column")
             
-            x_col = columns[0]
+            x_col = df.columns[0]
             
-            fig = px.histogram(
-                df, 
-                x=x_col,
-                title=title,
-                color_discrete_sequence=self.default_colors
-            )
+            fig = go.Figure(go.Histogram(
+                x=df.iloc[:, 0],
+                marker_color=DEFAULT_COLORS[0],
+                _validate=False
+            ))
             
             fig.update_layout(
-                xaxis_title=x_col.replace('_', ' ').title(),
+                title=title,
+                xaxis_title=_pretty(x_col),
                 yaxis_title='Count'
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating histogram: {e}")
+            logger.error("Error creating histogram: %s", e)
             return self._create_error_chart(f"Error creating histogram: {e}")
     
-    def create_heatmap(self, data: List[tuple], columns: List[str], title: str = "Heatmap") -> go.Figure:
+    def create_heatmap(self, data: List[tuple], columns: List[str], title: str = "Heatmap", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a heatmap from query results.
         
@@ -278,37 +593,65 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = pd.DataFrame(data, columns=columns)
-            
-            if len(columns) < 3:
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating heatmap: %s", e)
+            return self._create_error_chart(f"Error creating heatmap: {e}")
+        return self._create_heatmap_from_df(df, title)
+    
+    def _create_heatmap_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a heatmap from (row label, column label, value) columns of a prepared DataFrame."""
+        try:
+            if len(df.columns) < 3:
                 raise ValueError("Heatmap requires at least 3 columns")
             
-            # Pivot the data for heatmap
-            pivot_df = df.pivot(index=columns[0], columns=columns[1], values=columns[2])
-            
-            fig = px.imshow(
-                pivot_df,
-                title=title,
-                aspect="auto",
-                color_continuous_scale='Blues'
-            )
+            columns = list(df.columns[:3])
+            
+            # Bin the long-format rows straight into a dense grid instead of pivoting.
+            # Repeated (row, column) pairs are averaged, like pivot_table; cells
+            # without a value stay NaN and render as gaps. NULL labels get their
+            # own row/column, as with pivot, instead of the -1 sentinel code
+            row_codes, row_labels = pd.factorize(df.iloc[:, 0], sort=True, use_na_sentinel=False)
+            col_codes, col_labels = pd.factorize(df.iloc[:, 1], sort=True, use_na_sentinel=False)
+            shape = (len(row_labels), len(col_labels))
+            values = df.iloc[:, 2].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(values)
+            cells = np.ravel_multi_index((row_codes[valid], col_codes[valid]), shape)
+            sums = np.bincount(cells, weights=values[valid], minlength=shape[0] * shape[1])
+            counts = np.bincount(cells, minlength=shape[0] * shape[1])
+            z = np.full(shape[0] * shape[1], np.nan)
+            np.divide(sums, counts, out=z, where=counts > 0)
+            z = z.reshape(shape)
+            
+            fig = go.Figure(go.Heatmap(
+                z=z,
+                x=col_labels,
+                y=row_labels,
+                colorscale='Blues',
+                _validate=False
+            ))
             
             fig.update_layout(
-                xaxis_title=columns[1].replace('_', ' ').title(),
-                yaxis_title=columns[0].replace('_', ' ').title()
+                title=title,
+                xaxis_title=_pretty(columns[1]),
+                yaxis_title=_pretty(columns[0]),
+                # First row at the top, as in a table
+                yaxis_autorange='reversed'
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating heatmap: {e}")
+            logger.error("Error creating heatmap: %s", e)
             return self._create_error_chart(f"Error creating heatmap: {e}")
     
-    def create_violin_plot(self, data: List[tuple], columns: List[str], title: str = "Violin Plot") -> go.Figure:
+    def create_violin_plot(self, data: List[tuple], columns: List[str], title: str = "Violin Plot", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a violin plot from query results for distribution analysis.
         
@@ -316,39 +659,47 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating violin plot: %s", e)
+            return self._create_error_chart(f"Error creating violin plot: {e}")
+        return self._create_violin_from_df(df, title)
+    
+    def _create_violin_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a violin plot from the first two columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Violin plot requires at least 2 columns")
             
-            x_col = df.columns[0]
-            y_col = df.columns[1]
+            x_col, y_col = df.columns[0], df.columns[1]
             
-            fig = px.violin(
-                df, 
-                x=x_col, 
-                y=y_col,
-                title=title,
-                box=True,
-                color_discrete_sequence=self.default_colors
-            )
+            fig = go.Figure(go.Violin(
+                x=df.iloc[:, 0],
+                y=df.iloc[:, 1],
+                box_visible=True,
+                line_color=DEFAULT_COLORS[0],
+                _validate=False
+            ))
             
             fig.update_layout(
-                xaxis_title=x_col.replace('_', ' ').title(),
-                yaxis_title=y_col.replace('_', ' ').title()
+                title=title,
+                xaxis_title=_pretty(x_col),
+                yaxis_title=_pretty(y_col)
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating violin plot: {e}")
+            logger.error("Error creating violin plot: %s", e)
             return self._create_error_chart(f"Error creating violin plot: {e}")
     
-    def create_funnel_chart(self, data: List[tuple], columns: List[str], title: str = "Funnel Chart") -> go.Figure:
+    def create_funnel_chart(self, data: List[tuple], columns: List[str], title: str = "Funnel Chart", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a funnel chart for conversion analysis.
         
@@ -356,23 +707,30 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating funnel chart: %s", e)
+            return self._create_error_chart(f"Error creating funnel chart: {e}")
+        return self._create_funnel_from_df(df, title)
+    
+    def _create_funnel_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a funnel chart from (stage, value) columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Funnel chart requires at least 2 columns")
             
-            names_col = df.columns[0]
-            values_col = df.columns[1]
-            
             fig = go.Figure(go.Funnel(
-                y=df[names_col],
-                x=df[values_col],
-                textinfo="value+percent initial"
+                y=df.iloc[:, 0],
+                x=df.iloc[:, 1],
+                textinfo="value+percent initial",
+                _validate=False
             ))
             
             fig.update_layout(
@@ -382,10 +740,10 @@ class PlotlyChartGenerator:
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating funnel chart: {e}")
+            logger.error("Error creating funnel chart: %s", e)
             return self._create_error_chart(f"Error creating funnel chart: {e}")
     
-    def create_waterfall_chart(self, data: List[tuple], columns: List[str], title: str = "Waterfall Chart") -> go.Figure:
+    def create_waterfall_chart(self, data: List[tuple], columns: List[str], title: str = "Waterfall Chart", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a waterfall chart for breakdown analysis.
         
@@ -393,26 +751,39 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating waterfall chart: %s", e)
+            return self._create_error_chart(f"Error creating waterfall chart: {e}")
+        return self._create_waterfall_from_df(df, title)
+    
+    def _create_waterfall_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a waterfall chart from (step, amount) columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Waterfall chart requires at least 2 columns")
             
-            x_col = df.columns[0]
-            y_col = df.columns[1]
+            # Every step is relative except the closing total bar
+            measure = np.empty(len(df), dtype=object)
+            measure[:] = "relative"
+            if len(measure) > 0:
+                measure[-1] = "total"
             
             fig = go.Figure(go.Waterfall(
                 name="",
                 orientation="v",
-                measure=["relative"] * (len(df) - 1) + ["total"],
-                x=df[x_col],
-                y=df[y_col],
+                measure=measure,
+                x=df.iloc[:, 0],
+                y=df.iloc[:, 1],
                 connector={"line": {"color": "rgb(63, 63, 63)"}},
+                _validate=False,
             ))
             
             fig.update_layout(
@@ -422,10 +793,10 @@ class PlotlyChartGenerator:
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating waterfall chart: {e}")
+            logger.error("Error creating waterfall chart: %s", e)
             return self._create_error_chart(f"Error creating waterfall chart: {e}")
     
-    def create_statistical_summary_chart(self, data: List[tuple], columns: List[str], title: str = "Statistical Summary") -> go.Figure:
+    def create_statistical_summary_chart(self, data: List[tuple], columns: List[str], title: str = "Statistical Summary", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a statistical summary visualization with multiple metrics.
         
@@ -433,16 +804,22 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = pd.DataFrame(data, columns=columns)
-            
-            # Create subplots for multiple statistical views
-            from plotly.subplots import make_subplots
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating statistical summary: %s", e)
+            return self._create_error_chart(f"Error creating statistical summary: {e}")
+        return self._create_statistical_summary_from_df(df, title)
+    
+    def _create_statistical_summary_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create the four-panel statistical summary for the first numeric column of a prepared DataFrame."""
+        try:
             fig = make_subplots(
                 rows=2, cols=2,
                 subplot_titles=("Distribution", "Box Plot", "Summary Stats", "Outliers"),
@@ -451,24 +828,22 @@ class PlotlyChartGenerator:
             )
             
             # Assume first numeric column for analysis
-            numeric_col = None
-            for col in columns:
-                if df[col].dtype in ['int64', 'float64']:
-                    numeric_col = col
+            values = None
+            for i in range(len(df.columns)):
+                if df.iloc[:, i].dtype in ['int64', 'float64']:
+                    values = df.iloc[:, i]
                     break
             
-            if numeric_col:
-                values = df[numeric_col]
-                
+            if values is not None:
                 # Distribution histogram
                 fig.add_trace(
-                    go.Histogram(x=values, name="Distribution"),
+                    go.Histogram(x=values, name="Distribution", _validate=False),
                     row=1, col=1
                 )
                 
                 # Box plot
                 fig.add_trace(
-                    go.Box(y=values, name="Box Plot"),
+                    go.Box(y=values, name="Box Plot", _validate=False),
                     row=1, col=2
                 )
                 
@@ -489,7 +864,8 @@ class PlotlyChartGenerator:
                 fig.add_trace(
                     go.Table(
                         header=dict(values=list(stats.keys())),
-                        cells=dict(values=list(stats.values()))
+                        cells=dict(values=list(stats.values())),
+                        _validate=False
                     ),
                     row=2, col=1
                 )
@@ -506,7 +882,8 @@ class PlotlyChartGenerator:
                         y=outliers,
                         mode='markers',
                         name="Outliers",
-                        marker=dict(color='red', size=8)
+                        marker=dict(color='red', size=8),
+                        _validate=False
                     ),
                     row=2, col=2
                 )
@@ -515,10 +892,10 @@ class PlotlyChartGenerator:
             return fig
             
         except Exception as e:
-            logger.error(f"Error creating statistical summary: {e}")
+            logger.error("Error creating statistical summary: %s", e)
             return self._create_error_chart(f"Error creating statistical summary: {e}")
 
-    def create_box_plot(self, data: List[tuple], columns: List[str], title: str = "Box Plot") -> go.Figure:
+    def create_box_plot(self, data: List[tuple], columns: List[str], title: str = "Box Plot", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Create a box plot from query results.
         
@@ -526,38 +903,76 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. by auto_generate_chart
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = self._create_safe_dataframe(data, columns)
-            
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+        except Exception as e:
+            logger.error("Error creating box plot: %s", e)
+            return self._create_error_chart(f"Error creating box plot: {e}")
+        return self._create_box_from_df(df, title)
+    
+    def _create_box_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Create a box plot from the first two columns of a prepared DataFrame."""
+        try:
             if len(df.columns) < 2:
                 raise ValueError("Box plot requires at least 2 columns")
             
-            x_col = df.columns[0]
-            y_col = df.columns[1]
+            x_col, y_col = df.columns[0], df.columns[1]
             
-            fig = px.box(
-                df, 
-                x=x_col, 
-                y=y_col,
-                title=title,
-                color_discrete_sequence=self.default_colors
-            )
+            fig = go.Figure(go.Box(
+                x=df.iloc[:, 0],
+                y=df.iloc[:, 1],
+                marker_color=DEFAULT_COLORS[0],
+                _validate=False
+            ))
             
             fig.update_layout(
-                xaxis_title=x_col.replace('_', ' ').title(),
-                yaxis_title=y_col.replace('_', ' ').title()
+                title=title,
+                xaxis_title=_pretty(x_col),
+                yaxis_title=_pretty(y_col)
             )
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating box plot: {e}")
+            logger.error("Error creating box plot: %s", e)
             return self._create_error_chart(f"Error creating box plot: {e}")
     
-    def auto_generate_chart(self, data: List[tuple], columns: List[str], title: str = "Auto Chart") -> go.Figure:
+    def _question_intent(self, columns: List[str], title: str) -> Optional[str]:
+        """
+        Detect analysis intent from the question wording and column names.
+        
+        Args:
+            columns: List of column names
+            title: Chart title (usually the user's question)
+            
+        Returns:
+            Intent name used as a dispatch key, or None for plain shape-based dispatch
+        """
+        if len(columns) < 2:
+            return None
+        
+        title_lower = title.lower()
+        
+        if any(keyword in title_lower for keyword in self._STATISTICAL_KEYWORDS):
+            columns_lower = [str(col).lower() for col in columns]
+            has_stat_cols = any(stat in col for col in columns_lower for stat in self._STATISTICAL_COLUMN_MARKERS)
+            if has_stat_cols or 'distribution' in title_lower:
+                return 'statistical_summary'
+            if 'percentile' in title_lower or 'quartile' in title_lower:
+                return 'percentile'
+            return 'statistical'
+        if any(keyword in title_lower for keyword in self._CONVERSION_KEYWORDS):
+            return 'conversion'
+        if any(keyword in title_lower for keyword in self._BREAKDOWN_KEYWORDS):
+            return 'breakdown'
+        return None
+    
+    def auto_generate_chart(self, data: List[tuple], columns: List[str], title: str = "Auto Chart", df: Optional[pd.DataFrame] = None) -> go.Figure:
         """
         Automatically generate the most appropriate chart based on data characteristics and query context.
         
@@ -565,94 +980,53 @@ class PlotlyChartGenerator:
             data: List of tuples containing query results
             columns: List of column names
             title: Chart title
+            df: DataFrame already built from data, e.g. for a raw data table
             
         Returns:
             Plotly Figure object
         """
         try:
-            df = pd.DataFrame(data, columns=columns)
-            
-            # Analyze title and column names for statistical indicators
-            title_lower = title.lower()
-            columns_lower = [col.lower() for col in columns]
-            
-            # Check for statistical analysis keywords
-            statistical_keywords = ['standard deviation', 'std dev', 'variance', 'coefficient', 'percentile', 
-                                 'quartile', 'distribution', 'outlier', 'correlation', 'volatility']
-            conversion_keywords = ['conversion', 'funnel', 'pipeline', 'flow']
-            breakdown_keywords = ['breakdown', 'waterfall', 'contribution', 'decomposition']
-            
-            is_statistical = any(keyword in title_lower for keyword in statistical_keywords)
-            is_conversion = any(keyword in title_lower for keyword in conversion_keywords)
-            is_breakdown = any(keyword in title_lower for keyword in breakdown_keywords)
-            
-            # Statistical analysis - use advanced visualizations
-            if is_statistical and len(columns) >= 2:
-                # Check if we have statistical measures in column names
-                stat_cols = [col for col in columns_lower if any(stat in col for stat in ['std', 'deviation', 'variance', 'coefficient'])]
-                if stat_cols or 'distribution' in title_lower:
-                    return self.create_statistical_summary_chart(data, columns, title)
-                elif 'percentile' in title_lower or 'quartile' in title_lower:
-                    return self.create_box_plot(data, columns, title)
-                else:
-                    return self.create_violin_plot(data, columns, title)
-            
-            # Conversion analysis
-            elif is_conversion and len(columns) >= 2:
-                return self.create_funnel_chart(data, columns, title)
-            
-            # Breakdown analysis
-            elif is_breakdown and len(columns) >= 2:
-                return self.create_waterfall_chart(data, columns, title)
-            
-            # Standard logic for non-statistical queries
-            elif len(columns) == 1:
-                # Single column - histogram
-                return self.create_histogram(data, columns, title)
-            elif len(columns) == 2:
-                # Two columns - determine best chart type
-                col1_dtype = df[columns[0]].dtype
-                col2_dtype = df[columns[1]].dtype
-                
-                # If first column is categorical and second is numeric
-                if col1_dtype == 'object' and pd.api.types.is_numeric_dtype(col2_dtype):
-                    # Check if we have few categories (good for pie chart)
-                    if len(df[columns[0]].unique()) <= 8:
-                        return self.create_pie_chart(data, columns, title)
-                    else:
-                        return self.create_bar_chart(data, columns, title)
-                
-                # If both are numeric
-                elif pd.api.types.is_numeric_dtype(col1_dtype) and pd.api.types.is_numeric_dtype(col2_dtype):
-                    return self.create_scatter_plot(data, columns, title)
-                
-                # If first column looks like dates
-                elif 'date' in columns[0].lower() or 'time' in columns[0].lower():
-                    return self.create_line_chart(data, columns, title)
-                
-                # Default to bar chart
-                else:
-                    return self.create_bar_chart(data, columns, title)
-            
-            # Multiple columns with specific patterns
-            elif len(columns) >= 3:
-                # Check for heatmap patterns (3+ columns with categorical x numeric)
-                if (df[columns[0]].dtype == 'object' and 
-                    df[columns[1]].dtype == 'object' and 
-                    pd.api.types.is_numeric_dtype(df[columns[2]].dtype)):
-                    return self.create_heatmap(data, columns, title)
-                else:
-                    # Default to bar chart with first two columns
-                    return self.create_bar_chart(data, columns[:2], title)
-            
-            else:
-                # Fallback to bar chart
-                return self.create_bar_chart(data, columns[:2], title)
-                
+            # Build the DataFrame once and hand it to the chosen chart builder
+            if df is None:
+                df = self._create_safe_dataframe(data, columns)
+            return self._auto_chart_from_df(df, title)
         except Exception as e:
-            logger.error(f"Error auto-generating chart: {e}")
+            logger.error("Error auto-generating chart: %s", e)
             return self._create_error_chart(f"Error auto-generating chart: {e}")
     
+    def _auto_chart_from_df(self, df: pd.DataFrame, title: str) -> go.Figure:
+        """Pick a chart for a prepared DataFrame from the question wording, then its shape."""
+        key = self._question_intent(list(df.columns), title) or _classify(df)
+        return self._dispatch.get(key, self._create_bar_from_df)(df, title)
+    
+    def create_chart_from_columns(self, columns_dict: Dict[str, Any], title: str = "Auto Chart",
+                                  chart_type: Optional[str] = None) -> go.Figure:
+        """
+        Create a chart from column arrays instead of row tuples.
+        
+        Accepts what columnar sources return natively, e.g. DuckDB's fetchnumpy()
+        or an Arrow table's to_pydict(), so no per-row Python tuples are built.
+        
+        Args:
+            columns_dict: Mapping of column name to array or list of values, in column order
+            title: Chart title
+            chart_type: One of COLUMN_CHART_TYPES; None picks a chart like auto_generate_chart
+            
+        Returns:
+            Plotly Figure object
+        """
+        try:
+            if chart_type is not None and chart_type not in self.COLUMN_CHART_TYPES:
+                raise ValueError(f"Unsupported chart type: {chart_type}")
+            
+            df = pd.DataFrame(columns_dict, copy=False)
+            if chart_type is None:
+                return self._auto_chart_from_df(df, title)
+            return getattr(self, f"_create_{chart_type}_from_df")(df, title)
+        except Exception as e:
+            logger.error("Error creating chart from columns: %s", e)
+            return self._create_error_chart(f"Error creating chart from columns: {e}")
+    
     def _create_error_chart(self, error_message: str) -> go.Figure:
         """
         Create an error chart to display when chart generation fails.
@@ -663,20 +1037,41 @@ class PlotlyChartGenerator:
         Returns:
             Plotly Figure object with error message
         """
-        fig = go.Figure()
-        fig.add_annotation(
-            text=f"❌ {error_message}",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5,
-            showarrow=False,
-            font=dict(size=16, color="red")
-        )
-        fig.update_layout(
-            title="Chart Generation Error",
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False)
-        )
-        return fig
+        return _error_figure(error_message)
+    
+    def _build_single_trace(self, index: int, data_set: Dict[str, Any], grid_cols: int) -> Optional[tuple]:
+        """
+        Build the trace for one dashboard panel.
+        
+        Args:
+            index: Position of the panel in the dashboard
+            data_set: Dataset with 'data', 'columns', 'title', and 'chart_type'
+            grid_cols: Number of columns in the subplot grid
+            
+        Returns:
+            Tuple of (trace, row, col), or None if the panel cannot be drawn
+        """
+        chart_type = data_set.get('chart_type', 'bar')
+        data = data_set.get('data', [])
+        columns = data_set.get('columns', [])
+        name = data_set.get('title', f'Chart {index+1}')
+        
+        spec = _PANEL_TRACES.get(chart_type)
+        if spec is None or len(columns) < 2:
+            return None
+        trace_cls, x_key, y_key, fixed = spec
+        
+        # Column-wise view of the rows, without building a DataFrame
+        column_values = _as_columns(data) or [(), ()]
+        x_values, y_values = column_values[0], column_values[1]
+        
+        # WebGL keeps large line/scatter panels responsive in the browser
+        if trace_cls is go.Scatter and len(x_values) > _WEBGL_MIN_POINTS:
+            trace_cls = go.Scattergl
+        
+        trace = trace_cls(**{x_key: x_values, y_key: y_values}, name=name, _validate=False, **fixed)
+        
+        return trace, index // grid_cols + 1, index % grid_cols + 1
     
     def create_dashboard(self, data_sets: List[Dict[str, Any]], title: str = "Dashboard") -> go.Figure:
         """
@@ -694,48 +1089,21 @@ class PlotlyChartGenerator:
             if num_charts == 0:
                 return self._create_error_chart("No data provided for dashboard")
             
-            # Calculate subplot layout
-            if num_charts == 1:
-                rows, cols = 1, 1
-            elif num_charts == 2:
-                rows, cols = 1, 2
-            elif num_charts <= 4:
-                rows, cols = 2, 2
-            else:
-                rows, cols = 3, 2
-                
-            fig = make_subplots(
-                rows=rows, cols=cols,
-                subplot_titles=[ds.get('title', f'Chart {i+1}') for i, ds in enumerate(data_sets[:rows*cols])]
-            )
+            # Subplot grid for this many panels; anything beyond six is dropped
+            rows, cols = self._LAYOUTS.get(num_charts, (3, 2))
             
-            for i, ds in enumerate(data_sets[:rows*cols]):
-                row = i // cols + 1
-                col = i % cols + 1
-                
-                # Create individual chart
-                chart_type = ds.get('chart_type', 'bar')
-                data = ds.get('data', [])
-                columns = ds.get('columns', [])
-                
-                if chart_type == 'bar' and len(columns) >= 2:
-                    df = pd.DataFrame(data, columns=columns)
-                    fig.add_trace(
-                        go.Bar(x=df[columns[0]], y=df[columns[1]], name=ds.get('title', f'Chart {i+1}')),
-                        row=row, col=col
-                    )
-                elif chart_type == 'line' and len(columns) >= 2:
-                    df = pd.DataFrame(data, columns=columns)
-                    fig.add_trace(
-                        go.Scatter(x=df[columns[0]], y=df[columns[1]], mode='lines+markers', name=ds.get('title', f'Chart {i+1}')),
-                        row=row, col=col
-                    )
-                elif chart_type == 'pie' and len(columns) >= 2:
-                    df = pd.DataFrame(data, columns=columns)
-                    fig.add_trace(
-                        go.Pie(labels=df[columns[0]], values=df[columns[1]], name=ds.get('title', f'Chart {i+1}')),
-                        row=row, col=col
-                    )
+            panels = data_sets[:rows*cols]
+            subplot_titles = tuple(ds.get('title', f'Chart {i+1}') for i, ds in enumerate(panels))
+            fig = go.Figure(_dashboard_skeleton(rows, cols, subplot_titles))
+            
+            # Build traces concurrently; figure mutation stays on this thread
+            with ThreadPoolExecutor(max_workers=min(4, len(panels))) as executor:
+                built = list(executor.map(lambda panel: self._build_single_trace(*panel, cols), enumerate(panels)))
+            
+            for item in built:
+                if item is not None:
+                    trace, row, col = item
+                    fig.add_trace(trace, row=row, col=col)
             
             fig.update_layout(
                 title=title,
@@ -745,7 +1113,7 @@ class PlotlyChartGenerator:
             
             return fig
         except Exception as e:
-            logger.error(f"Error creating dashboard: {e}")
+            logger.error("Error creating dashboard: %s", e)
             return self._create_error_chart(f"Error creating dashboard: {e}")
 
 
@@ -777,29 +1145,15 @@ def suggest_chart_type(data: List[tuple], columns: List[str]) -> str:
         if not data or not columns:
             return "bar"
         
-        df = pd.DataFrame(data, columns=columns)
-        
-        if len(columns) == 1:
-            return "histogram"
-        elif len(columns) == 2:
-            col1_dtype = df[columns[0]].dtype
-            col2_dtype = df[columns[1]].dtype
-            
-            if col1_dtype == 'object' and pd.api.types.is_numeric_dtype(col2_dtype):
-                if len(df[columns[0]].unique()) <= 8:
-                    return "pie"
-                else:
-                    return "bar"
-            elif pd.api.types.is_numeric_dtype(col1_dtype) and pd.api.types.is_numeric_dtype(col2_dtype):
-                return "scatter"
-            elif 'date' in columns[0].lower() or 'time' in columns[0].lower():
-                return "line"
-            else:
-                return "bar"
-        else:
+        if len(columns) >= 3:
+            # Wide results are suggested as bar charts; auto_generate_chart may still
+            # draw a heatmap for category/category/number columns
             return "bar"
+        
+        df = chart_generator._create_safe_dataframe(data, columns)
+        return _classify(df).value
     except Exception as e:
-        logger.error(f"Error suggesting chart type: {e}")
+        logger.error("Error suggesting chart type: %s", e)
         return "bar"
 
 
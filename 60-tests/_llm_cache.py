@@ -0,0 +1,187 @@
+"""
+Persistent on-disk cache for LLM calls made by the test suite.
+
+SQL generation and story generation results are pickled into a small SQLite
+database keyed by SHA-256 of (backend, model, temperature, inputs), so reruns of
+the suite do not repeat the same OpenAI round-trips. Entries expire after seven days.
+The backend is either the live API base URL or the replay stub together with a
+hash of its fixture file, so editing fixtures/llm_fixtures.json takes effect on
+the next run and live results are never replayed in stub mode.
+
+Set LLM_LIVE=1 to bypass cached entries and call the model again; fresh
+results still overwrite the cache.
+
+Identical calls that are in flight at the same time share one model request:
+threads in a worker wait on a per-key lock, and pytest-xdist workers claim a
+key by writing a pending row (value NULL) and poll until the owner stores the
+result. A claim older than PENDING_TIMEOUT_SECONDS is treated as abandoned.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+CACHE_PATH = Path(__file__).parent.parent / ".pytest_llm_cache" / "llm_cache.sqlite3"
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+PENDING_TIMEOUT_SECONDS = 5 * 60
+POLL_INTERVAL_SECONDS = 0.1
+
+# Results newer than this count as fresh under LLM_LIVE=1 (produced by this run)
+_SESSION_START = time.time()
+
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+def _llm_live() -> bool:
+    """Return True when tests should ignore cached responses."""
+    return os.getenv("LLM_LIVE") == "1"
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, created REAL, value BLOB)"
+    )
+    return conn
+
+
+@lru_cache(maxsize=1)
+def _backend_id() -> str:
+    """Identify what answers LLM calls: the live API, or the replay stub and its fixtures."""
+    if _llm_live():
+        return "live:" + os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    from _llm_stub import FIXTURES_PATH
+    return "stub:" + hashlib.sha256(FIXTURES_PATH.read_bytes()).hexdigest()
+
+
+def _cache_key(kind: str, component: Any, *parts: Any) -> str:
+    """
+    Build the cache key for an LLM call.
+
+    Args:
+        kind: Call type, e.g. 'sql' or 'story'
+        component: Object owning the ChatOpenAI instance as `llm`
+        *parts: Inputs that determine the prompt
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    llm = getattr(component, "llm", None)
+    model = getattr(llm, "model_name", "")
+    temperature = getattr(llm, "temperature", "")
+    raw = "|".join([kind, _backend_id(), str(model), str(temperature)] + [repr(part) for part in parts])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _key_lock(key: str) -> threading.Lock:
+    """Return the in-process lock for a cache key."""
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _lookup_or_claim(key: str) -> Tuple[bool, Any]:
+    """
+    Read a usable cached result, or claim the key for this worker.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        (True, result) on a hit, (True, None) after claiming the key, or
+        (False, None) while another worker holds a live claim
+    """
+    oldest_usable = _SESSION_START if _llm_live() else time.time() - CACHE_TTL_SECONDS
+    conn = _connect()
+    conn.isolation_level = None
+    try:
+        # IMMEDIATE takes the write lock up front, so only one worker can claim
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT created, value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[1] is not None and row[0] >= oldest_usable:
+            conn.execute("COMMIT")
+            return True, pickle.loads(row[1])
+        if row is not None and row[1] is None and time.time() - row[0] < PENDING_TIMEOUT_SECONDS:
+            conn.execute("COMMIT")
+            return False, None
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, created, value) VALUES (?, ?, NULL)",
+            (key, time.time())
+        )
+        conn.execute("COMMIT")
+        return True, None
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def _cached_call(key: str, call: Callable[[], Any]) -> Any:
+    """Return the cached result for key, or run call once and store its result."""
+    with _key_lock(key):
+        ready, result = _lookup_or_claim(key)
+        while not ready:
+            time.sleep(POLL_INTERVAL_SECONDS)
+            ready, result = _lookup_or_claim(key)
+        if result is not None:
+            return result
+
+        try:
+            result = call()
+        except Exception:
+            # Release the claim so waiting workers retry instead of timing out
+            with _connect() as conn:
+                conn.execute("DELETE FROM llm_cache WHERE key = ? AND value IS NULL", (key,))
+            conn.close()
+            raise
+
+        with _connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created, value) VALUES (?, ?, ?)",
+                (key, time.time(), pickle.dumps(result))
+            )
+        conn.close()
+        return result
+
+
+def cached_generate_sql(sql_agent: Any, question: str) -> Any:
+    """
+    Cached wrapper around sql_agent.generate_sql.
+
+    Args:
+        sql_agent: SQLQueryGenerator instance
+        question: Natural language question
+
+    Returns:
+        QueryResult from the agent or the cache
+    """
+    key = _cache_key("sql", sql_agent, question)
+    return _cached_call(key, lambda: sql_agent.generate_sql(question))
+
+
+def cached_generate_story(story_generator: Any, question: str, query: str,
+                          data: List[tuple], columns: List[str]) -> Any:
+    """
+    Cached wrapper around story_generator.generate_story.
+
+    Args:
+        story_generator: StoryGenerator instance
+        question: Original business question
+        query: SQL query that was executed
+        data: Query results
+        columns: Column names
+
+    Returns:
+        StoryContent from the generator or the cache
+    """
+    key = _cache_key("story", story_generator, question, query, data, columns)
+    return _cached_call(key, lambda: story_generator.generate_story(question, query, data, columns))
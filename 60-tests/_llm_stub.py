@@ -0,0 +1,150 @@
+"""
+Local stand-in for the OpenAI chat completions API used by the test suite.
+
+Serves recorded responses from fixtures/llm_fixtures.json on localhost so the
+SQL agent and story generator run deterministically, offline and without
+spending tokens. A request is answered with the longest fixture whose 'match'
+text is contained in the prompt; SQL prompts and story prompts have separate
+fixture lists. Requests with stream=true get the response as server-sent
+chat.completion.chunk events, a few characters at a time. Unmatched prompts
+get an HTTP 404, which the components report as a failed generation.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "llm_fixtures.json"
+
+# Marker in the SQL agent's user prompt (see SQLQueryGenerator._create_sql_prompt)
+SQL_PROMPT_MARKER = "Generate a SQL query for this question:"
+
+# Characters of the response per streamed chunk, small so streams have many chunks
+STREAM_CHUNK_CHARS = 8
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Load recorded responses, longest match text first.
+
+    Args:
+        path: JSON file with 'sql' and 'story' lists of {'match', 'response'}
+
+    Returns:
+        Dictionary of fixture lists per prompt kind
+    """
+    fixtures = json.loads(path.read_text(encoding="utf-8"))
+    return {kind: sorted(entries, key=lambda entry: len(entry["match"]), reverse=True)
+            for kind, entries in fixtures.items()}
+
+
+def find_response(fixtures: Dict[str, List[Dict[str, str]]], prompt: str) -> Optional[str]:
+    """
+    Pick the recorded response for a prompt.
+
+    Args:
+        fixtures: Output of load_fixtures
+        prompt: All message contents of the request, joined
+
+    Returns:
+        Response text, or None if no fixture matches
+    """
+    kind = "sql" if SQL_PROMPT_MARKER in prompt else "story"
+    if kind == "sql":
+        # Only look at the question itself, not the schema in the system prompt
+        prompt = prompt.split(SQL_PROMPT_MARKER, 1)[1].split("\n", 1)[0]
+    for entry in fixtures.get(kind, []):
+        if entry["match"] in prompt:
+            return entry["response"]
+    return None
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """Answers POST .../chat/completions with a recorded response."""
+
+    fixtures: Dict[str, List[Dict[str, str]]] = {}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown endpoint {self.path}", "type": "invalid_request_error"}})
+            return
+
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        content = find_response(self.fixtures, prompt)
+        if content is None:
+            self._send(404, {"error": {"message": "No recorded response for prompt", "type": "invalid_request_error"}})
+            return
+
+        if body.get("stream"):
+            self._send_stream(body, content)
+            return
+
+        self._send(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        })
+
+    def _send_stream(self, body: dict, content: str) -> None:
+        """Send content as server-sent chat.completion.chunk events, ending with [DONE]."""
+        def chunk(delta: dict, finish_reason: Optional[str] = None) -> dict:
+            return {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+
+        events = [chunk({"role": "assistant", "content": ""})]
+        events += [chunk({"content": content[i:i + STREAM_CHUNK_CHARS]})
+                   for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+        events.append(chunk({}, "stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = chunk({})
+            usage["choices"] = []
+            usage["usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            events.append(usage)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for event in events:
+            self.wfile.write(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keep test output quiet
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    """
+    Start the stub on a free localhost port in a daemon thread.
+
+    Returns:
+        Running server; its base URL is f"http://127.0.0.1:{server.server_port}/v1"
+    """
+    handler = type("StubHandler", (_ChatCompletionsHandler,), {"fixtures": load_fixtures()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
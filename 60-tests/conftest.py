@@ -0,0 +1,93 @@
+"""
+Shared pytest configuration for the E-commerce Analytics Application tests.
+
+Adds the numbered module directories to sys.path once, before collection, and
+provides session-scoped fixtures so each pytest(-xdist) worker builds the
+database connection, schema, chart generator and LLM components only once. LLM calls
+are answered by a local replay stub (see _llm_stub.py) unless LLM_LIVE=1.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add module paths - navigate to parent directory first
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "30-database"))
+sys.path.append(str(project_root / "40-llm"))
+sys.path.append(str(project_root / "50-visualization"))
+sys.path.append(str(Path(__file__).parent))
+
+
+@pytest.fixture(scope="session")
+def db():
+    """Database connection shared by the whole session."""
+    from connection import get_database
+    return get_database()
+
+
+@pytest.fixture(scope="session")
+def schema():
+    """Database schema helper shared by the whole session."""
+    from schema import get_schema
+    return get_schema()
+
+
+@pytest.fixture(scope="session")
+def chart_generator():
+    """Chart generator shared by the whole session."""
+    from plotly_charts import get_chart_generator
+    return get_chart_generator()
+
+
+@pytest.fixture(scope="session")
+def llm_stub_server():
+    """
+    Point the OpenAI client at the local replay stub for the whole session.
+    
+    With LLM_LIVE=1 the real API (and OPENAI_API_KEY) is used instead.
+    """
+    if os.getenv("LLM_LIVE") == "1":
+        yield None
+        return
+    
+    from _llm_stub import start_stub_server
+    
+    server = start_stub_server()
+    overrides = {
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{server.server_port}/v1",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{server.server_port}/v1",
+        "OPENAI_API_KEY": "stub-key",
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    yield server
+    
+    server.shutdown()
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+@pytest.fixture(scope="session")
+def sql_agent(llm_stub_server):
+    """SQL agent shared by the whole session; skips when LangChain (or, live, the API key) is missing."""
+    try:
+        from sql_agent import get_sql_agent
+    except (ImportError, ValueError) as e:
+        pytest.skip(f"SQL agent unavailable: {e}")
+    return get_sql_agent()
+
+
+@pytest.fixture(scope="session")
+def story_generator(llm_stub_server):
+    """Story generator shared by the whole session; skips when LangChain (or, live, the API key) is missing."""
+    try:
+        from story_generator import get_story_generator
+    except (ImportError, ValueError) as e:
+        pytest.skip(f"Story generator unavailable: {e}")
+    return get_story_generator()
@@ -2,344 +2,369 @@
 """
 Comprehensive test suite for the E-commerce Analytics Application.
 
-This script tests all major components of the application to ensure
+This suite tests all major components of the application to ensure
 they work correctly before deployment.
+
+Run it sharded across CPU cores with pytest-xdist:
+
+    pytest -n auto --dist=loadfile 60-tests/
+
+Shared components come from the session fixtures in conftest.py. LLM requests
+are answered by a local replay stub serving fixtures/llm_fixtures.json (see
+_llm_stub.py) and cached on disk between runs (see _llm_cache.py); set
+LLM_LIVE=1 to call the real model instead. Use --durations=10 to list the
+slowest tests; with LLM_LIVE=1, test_sql_latency reports SQL generation
+timings when pytest-benchmark is installed.
 """
 
-import sys
+import asyncio
+import importlib.util
+import json
 import os
-from pathlib import Path
-import traceback
-import time
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import pytest
 
-# Add module paths - navigate to parent directory first
-project_root = Path(__file__).parent.parent
-sys.path.append(str(project_root / "30-database"))
-sys.path.append(str(project_root / "40-llm"))
-sys.path.append(str(project_root / "50-visualization"))
+# Skip the module at collection time if a core component cannot be imported.
+# sql_agent and story_generator are imported by their fixtures instead: they
+# need OPENAI_API_KEY, which the stub fixture only sets once the session starts.
+pytest.importorskip("connection")
+pytest.importorskip("schema")
+pytest.importorskip("plotly_charts")
 
-def test_database_components():
+from plotly_charts import suggest_chart_type
+from _llm_cache import cached_generate_sql, cached_generate_story
+
+# Test questions - including basic and advanced analytics. A tuple, so parallel
+# test cases can share it without risk of mutation
+TEST_QUESTIONS = (
+    # Basic Analytics
+    "What are the top 5 product categories by revenue?",
+    "Show me the average order value by shipping state",
+    "Which payment methods are most popular?",
+    # Advanced Statistical Analytics
+    "Calculate the standard deviation of order values by product category",
+    "Show me the coefficient of variation for sales across different states",
+    "What's the sales distribution percentile analysis (25th, 50th, 75th, 95th)?",
+    # Business Intelligence
+    "Identify high-value customer segments (customers with orders > 95th percentile)",
+    "Show purchase frequency analysis: customers by number of orders placed",
+    "Calculate conversion metrics: orders vs cancelled/returned orders by category",
+    # Advanced Business Analytics
+    "Show Pareto analysis: which 20% of products generate 80% of revenue?",
+    "Calculate market share by state and identify growth opportunities"
+)
+
+def test_database_components(db, schema):
     """Test database connection and schema components."""
-    print("🔍 Testing Database Components...")
-    
-    try:
-        from connection import get_database, test_connection
-        from schema import get_schema
-        
-        # Test database connection
-        print("  ✓ Database modules imported successfully")
-        
-        if test_connection():
-            print("  ✓ Database connection successful")
-        else:
-            print("  ❌ Database connection failed")
-            return False
-        
-        # Test database operations
-        db = get_database()
-        table_info = db.get_table_info()
-        print(f"  ✓ Database has {table_info['row_count']} rows")
-        
-        # Test schema operations
-        schema = get_schema()
-        categories = schema.get_categories_and_subcategories()
-        print(f"  ✓ Schema loaded with {len(categories)} categories")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ❌ Database test failed: {e}")
-        traceback.print_exc()
-        return False
-
-def test_llm_components():
+
+    # Test database connection
+    assert db.validate_connection(), "Database connection failed"
+
+    # Test database operations
+    table_info = db.get_table_info()
+    assert table_info['row_count'] > 0, "sales_table is empty"
+
+    # Test schema operations
+    categories = schema.get_categories_and_subcategories()
+    assert categories, "No product categories found"
+
+def test_llm_components(sql_agent, story_generator):
     """Test LLM components (SQL agent and story generator)."""
-    print("\n🤖 Testing LLM Components...")
-    
-    try:
-        from sql_agent import get_sql_agent
-        from story_generator import get_story_generator
-        
-        print("  ✓ LLM modules imported successfully")
-        
-        # Test SQL agent
-        sql_agent = get_sql_agent()
-        
-        # Test with a simple question
-        test_question = "What are the top 3 product categories by number of orders?"
-        print(f"  🔍 Testing SQL generation: {test_question}")
-        
-        result = sql_agent.generate_sql(test_question)
-        
-        if result.success:
-            print(f"  ✓ SQL generated successfully: {result.query[:100]}...")
-            print(f"  ✓ Query returned {len(result.data)} rows")
-        else:
-            print(f"  ❌ SQL generation failed: {result.error}")
-            return False
-        
-        # Test story generator
-        story_generator = get_story_generator()
-        
-        print("  📝 Testing story generation...")
-        story = story_generator.generate_story(
-            test_question,
-            result.query,
-            result.data,
-            ['product_category', 'order_count']
-        )
-        
-        if story.executive_summary:
-            print(f"  ✓ Story generated successfully")
-            print(f"  ✓ Executive summary: {story.executive_summary[:100]}...")
-        else:
-            print("  ❌ Story generation failed")
-            return False
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ❌ LLM test failed: {e}")
-        traceback.print_exc()
-        return False
-
-def test_visualization_components():
-    """Test visualization components."""
-    print("\n📊 Testing Visualization Components...")
-    
-    try:
-        from plotly_charts import get_chart_generator, suggest_chart_type
-        
-        print("  ✓ Visualization modules imported successfully")
-        
-        # Test chart generator
-        chart_generator = get_chart_generator()
-        
-        # Sample data for testing
-        sample_data = [
-            ('Electronics', 1500, 45),
-            ('Clothing', 1200, 38),
-            ('Books', 800, 25),
-            ('Home', 600, 18)
-        ]
-        
-        columns = ['category', 'revenue', 'orders']
-        
-        # Test chart generation
-        fig = chart_generator.auto_generate_chart(sample_data, columns, "Test Chart")
-        
-        if fig:
-            print("  ✓ Chart generated successfully")
-        else:
-            print("  ❌ Chart generation failed")
-            return False
-        
-        # Test advanced chart types
-        statistical_data = [
-            ('Electronics', 150.5, 45.2, 125.0),
-            ('Clothing', 120.3, 38.1, 98.5),
-            ('Books', 80.7, 25.4, 72.3),
-            ('Home', 60.2, 18.9, 55.1)
-        ]
-        stat_columns = ['category', 'mean_value', 'std_deviation', 'median_value']
-        
-        # Test statistical chart
-        stat_fig = chart_generator.create_statistical_summary_chart(
-            statistical_data, stat_columns, "Statistical Analysis Test"
-        )
-        if stat_fig:
-            print("  ✓ Statistical summary chart generated successfully")
-        else:
-            print("  ❌ Statistical summary chart failed")
-            return False
-        
-        # Test violin plot
-        violin_fig = chart_generator.create_violin_plot(sample_data, columns, "Violin Plot Test")
-        if violin_fig:
-            print("  ✓ Violin plot generated successfully")
-        else:
-            print("  ❌ Violin plot failed")
-            return False
-        
-        # Test funnel chart
-        funnel_data = [('Visited', 1000), ('Added to Cart', 300), ('Checkout', 150), ('Purchased', 100)]
-        funnel_columns = ['stage', 'count']
-        funnel_fig = chart_generator.create_funnel_chart(funnel_data, funnel_columns, "Conversion Funnel")
-        if funnel_fig:
-            print("  ✓ Funnel chart generated successfully")
-        else:
-            print("  ❌ Funnel chart failed")
-            return False
-        
-        # Test chart type suggestion
-        suggested_type = suggest_chart_type(sample_data, columns)
-        print(f"  ✓ Chart type suggestion: {suggested_type}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ❌ Visualization test failed: {e}")
-        traceback.print_exc()
-        return False
-
-def test_end_to_end_workflow():
-    """Test complete end-to-end workflow."""
-    print("\n🔄 Testing End-to-End Workflow...")
-    
-    try:
-        from sql_agent import get_sql_agent
-        from story_generator import get_story_generator
-        from plotly_charts import get_chart_generator
-        
-        # Initialize components
-        sql_agent = get_sql_agent()
-        story_generator = get_story_generator()
-        chart_generator = get_chart_generator()
-        
-        # Test questions - including basic and advanced analytics
-        test_questions = [
-            # Basic Analytics
-            "What are the top 5 product categories by revenue?",
-            "Show me the average order value by shipping state",
-            "Which payment methods are most popular?",
-            # Advanced Statistical Analytics
-            "Calculate the standard deviation of order values by product category",
-            "Show me the coefficient of variation for sales across different states",
-            "What's the sales distribution percentile analysis (25th, 50th, 75th, 95th)?",
-            # Business Intelligence
-            "Identify high-value customer segments (customers with orders > 95th percentile)",
-            "Show purchase frequency analysis: customers by number of orders placed",
-            "Calculate conversion metrics: orders vs cancelled/returned orders by category",
-            # Advanced Business Analytics  
-            "Show Pareto analysis: which 20% of products generate 80% of revenue?",
-            "Calculate market share by state and identify growth opportunities"
-        ]
-        
-        for i, question in enumerate(test_questions, 1):
-            print(f"\n  Test {i}: {question}")
-            
-            # Generate SQL
-            start_time = time.time()
-            result = sql_agent.generate_sql(question)
-            sql_time = time.time() - start_time
-            
-            if not result.success:
-                print(f"    ❌ SQL generation failed: {result.error}")
-                continue
-            
-            print(f"    ✓ SQL generated in {sql_time:.2f}s")
-            
-            # Generate story
-            start_time = time.time()
-            story = story_generator.generate_story(
-                question,
-                result.query,
-                result.data,
-                ['column1', 'column2']  # Simplified for test
-            )
-            story_time = time.time() - start_time
-            
-            print(f"    ✓ Story generated in {story_time:.2f}s")
-            
-            # Generate chart
-            start_time = time.time()
-            fig = chart_generator.auto_generate_chart(
-                result.data,
-                ['category', 'value'],
-                question
-            )
-            chart_time = time.time() - start_time
-            
-            print(f"    ✓ Chart generated in {chart_time:.2f}s")
-            print(f"    ✓ Total time: {sql_time + story_time + chart_time:.2f}s")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ❌ End-to-end test failed: {e}")
-        traceback.print_exc()
-        return False
-
-def test_error_handling():
-    """Test error handling scenarios."""
-    print("\n⚠️  Testing Error Handling...")
-    
-    try:
-        from sql_agent import get_sql_agent
-        
-        sql_agent = get_sql_agent()
-        
-        # Test with invalid question
-        invalid_questions = [
-            "DELETE FROM sales_table",  # Dangerous query
-            "",  # Empty question
-            "What is the meaning of life?",  # Irrelevant question
-        ]
-        
-        for question in invalid_questions:
-            print(f"  Testing invalid question: {question[:50]}...")
-            result = sql_agent.generate_sql(question)
-            
-            if not result.success:
-                print(f"    ✓ Properly handled error: {result.error}")
-            else:
-                print(f"    ⚠️  Expected error but got success")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ❌ Error handling test failed: {e}")
-        traceback.print_exc()
-        return False
-
-def main():
-    """Run all tests."""
-    print("🧪 E-commerce Analytics Application Test Suite")
-    print("=" * 50)
-    
-    # Track test results
-    tests = [
-        ("Database Components", test_database_components),
-        ("LLM Components", test_llm_components),
-        ("Visualization Components", test_visualization_components),
-        ("End-to-End Workflow", test_end_to_end_workflow),
-        ("Error Handling", test_error_handling)
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test_name, test_func in tests:
-        print(f"\n{'='*50}")
-        print(f"Running: {test_name}")
-        print(f"{'='*50}")
-        
+
+    # Test with a simple question
+    test_question = "What are the top 3 product categories by number of orders?"
+
+    result = cached_generate_sql(sql_agent, test_question)
+
+    assert result.success, f"SQL generation failed: {result.error}"
+
+    # Test story generator
+    story = cached_generate_story(
+        story_generator,
+        test_question,
+        result.query,
+        result.data,
+        ['product_category', 'order_count']
+    )
+
+    assert story.executive_summary, "Story generation failed"
+
+def test_story_stream(story_generator):
+    """The executive summary arrives in several pieces before the full story is returned."""
+    stream = story_generator.generate_story_stream(
+        "What are the top 3 product categories by number of orders?",
+        "SELECT product_category, COUNT(*) AS order_count FROM sales_table GROUP BY 1 ORDER BY 2 DESC LIMIT 3",
+        [('Electronics', 120), ('Clothing', 95), ('Books', 60)],
+        ['product_category', 'order_count']
+    )
+    pieces = []
+    while True:
         try:
-            if test_func():
-                print(f"✅ {test_name} PASSED")
-                passed += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-                failed += 1
-        except Exception as e:
-            print(f"❌ {test_name} FAILED with exception: {e}")
-            failed += 1
-    
-    # Summary
-    print(f"\n{'='*50}")
-    print(f"TEST SUMMARY")
-    print(f"{'='*50}")
-    print(f"✅ Passed: {passed}")
-    print(f"❌ Failed: {failed}")
-    print(f"Total: {passed + failed}")
-    
-    if failed == 0:
-        print(f"\n🎉 All tests passed! Application is ready for use.")
-        return 0
-    else:
-        print(f"\n⚠️  {failed} test(s) failed. Please check the errors above.")
-        return 1
-
-if __name__ == "__main__":
-    exit_code = main()
-    sys.exit(exit_code)
\ No newline at end of file
+            pieces.append(next(stream))
+        except StopIteration as done:
+            story = done.value
+            break
+
+    assert story.success, story.executive_summary
+    assert len(pieces) > 1, "Executive summary was not streamed"
+    assert "".join(pieces) == story.executive_summary
+
+def test_error_story_is_flagged(story_generator):
+    """Failed generations are marked so callers can avoid caching them."""
+    assert story_generator._create_error_story("timeout").success is False
+
+# Chart samples as query-result rows, the shape the SQL agent returns. Tuples,
+# so the chart tests can share them without risk of mutation
+SAMPLE_ROWS = (
+    ('Electronics', 1500, 45),
+    ('Clothing', 1200, 38),
+    ('Books', 800, 25),
+    ('Home', 600, 18),
+)
+SAMPLE_COLUMNS = ('category', 'revenue', 'orders')
+
+STATISTICAL_ROWS = (
+    ('Electronics', 150.5, 45.2, 125.0),
+    ('Clothing', 120.3, 38.1, 98.5),
+    ('Books', 80.7, 25.4, 72.3),
+    ('Home', 60.2, 18.9, 55.1),
+)
+STATISTICAL_COLUMNS = ('category', 'mean_value', 'std_deviation', 'median_value')
+
+FUNNEL_ROWS = (('Visited', 1000), ('Added to Cart', 300), ('Checkout', 150), ('Purchased', 100))
+FUNNEL_COLUMNS = ('stage', 'count')
+
+def test_auto_generate_chart(chart_generator):
+    """Category/number rows are drawn as a bar chart."""
+    fig = chart_generator.auto_generate_chart(list(SAMPLE_ROWS), list(SAMPLE_COLUMNS), "Test Chart")
+    assert fig.data[0].type == 'bar'
+    assert fig.layout.title.text == "Test Chart"
+
+def test_chart_from_columns(chart_generator):
+    """NumPy columns give the same chart as the equivalent rows."""
+    columns = {
+        'category': np.array(['Electronics', 'Clothing', 'Books', 'Home']),
+        'revenue': np.array([1500, 1200, 800, 600]),
+        'orders': np.array([45, 38, 25, 18])
+    }
+    fig = chart_generator.create_chart_from_columns(columns, "Test Chart")
+    assert fig.data[0].type == 'bar'
+    assert fig.layout.title.text == "Test Chart"
+
+def test_statistical_summary_chart(chart_generator):
+    """Statistical summary panels hold a histogram, box plot, table and scatter."""
+    fig = chart_generator.create_statistical_summary_chart(
+        list(STATISTICAL_ROWS), list(STATISTICAL_COLUMNS), "Statistical Analysis Test"
+    )
+    assert [trace.type for trace in fig.data] == ['histogram', 'box', 'table', 'scatter']
+    assert fig.layout.title.text == "Statistical Analysis Test"
+
+def test_violin_plot(chart_generator):
+    """Violin plot from category/number rows."""
+    fig = chart_generator.create_violin_plot(list(SAMPLE_ROWS), list(SAMPLE_COLUMNS), "Violin Plot Test")
+    assert fig.data[0].type == 'violin'
+    assert fig.layout.title.text == "Violin Plot Test"
+
+def test_funnel_chart(chart_generator):
+    """Funnel chart from (stage, count) rows."""
+    fig = chart_generator.create_funnel_chart(list(FUNNEL_ROWS), list(FUNNEL_COLUMNS), "Conversion Funnel")
+    assert fig.data[0].type == 'funnel'
+    assert fig.layout.title.text == "Conversion Funnel"
+
+def test_heatmap(chart_generator):
+    """Heatmap from (row label, column label, value) rows."""
+    fig = chart_generator.create_heatmap(
+        [('A', 'x', 1), ('A', 'y', 2), ('B', 'x', 3)], ['region', 'channel', 'revenue'], "Revenue Heatmap"
+    )
+    assert fig.data[0].type == 'heatmap'
+    assert fig.layout.title.text == "Revenue Heatmap"
+
+def test_scatter_plot_categories(chart_generator):
+    """A categorical third column gives one scatter trace per category."""
+    fig = chart_generator.create_scatter_plot(
+        [(1, 2, 'A'), (2, 3, 'B'), (3, 4, 'A')], ['visits', 'orders', 'segment'], "Segments"
+    )
+    assert [trace.type for trace in fig.data] == ['scattergl', 'scattergl']
+    assert [trace.name for trace in fig.data] == ['A', 'B']
+    assert fig.layout.legend.title.text == 'segment'
+    assert fig.layout.title.text == "Segments"
+
+def test_waterfall_chart(chart_generator):
+    """Waterfall steps are relative except the closing total."""
+    fig = chart_generator.create_waterfall_chart(
+        [('Start', 100), ('Returns', -20), ('Total', 80)], ['step', 'amount'], "Revenue Bridge"
+    )
+    assert fig.data[0].type == 'waterfall'
+    assert list(fig.data[0].measure) == ['relative', 'relative', 'total']
+    assert fig.layout.title.text == "Revenue Bridge"
+
+def test_dashboard(chart_generator):
+    """Dashboard panels keep their chart types."""
+    fig = chart_generator.create_dashboard([
+        {'data': list(SAMPLE_ROWS), 'columns': list(SAMPLE_COLUMNS), 'title': 'Revenue', 'chart_type': 'bar'},
+        {'data': list(FUNNEL_ROWS), 'columns': list(FUNNEL_COLUMNS), 'title': 'Stages', 'chart_type': 'line'},
+    ])
+    assert [trace.type for trace in fig.data] == ['bar', 'scatter']
+    assert [annotation.text for annotation in fig.layout.annotations] == ['Revenue', 'Stages']
+    assert fig.layout.title.text == "Dashboard"
+
+def test_suggest_chart_type():
+    """Chart type suggestion for category/number rows."""
+    suggested_type = suggest_chart_type(list(SAMPLE_ROWS), list(SAMPLE_COLUMNS))
+    assert suggested_type == "bar", f"Unexpected chart type suggestion: {suggested_type}"
+
+def test_suggest_chart_type_wide_categories(chart_generator):
+    """Category/category/number rows are suggested as bar even though they auto-chart as a heatmap."""
+    rows = [('A', 'x', 1), ('A', 'y', 2), ('B', 'x', 3)]
+    columns = ['region', 'channel', 'revenue']
+    assert suggest_chart_type(rows, columns) == "bar"
+    assert chart_generator.auto_generate_chart(rows, columns).data[0].type == 'heatmap'
+
+def test_numeric_rows_are_column_major():
+    """Only all-int or all-float results take the Fortran-ordered matrix path."""
+    from frames import numeric_matrix, rows_to_dataframe
+
+    for rows in ([(2023, 10), (2024, 12)], [(2.5, 1.0), (3.5, 2.0)]):
+        assert numeric_matrix(rows) is not None
+        assert rows_to_dataframe(rows, ['a', 'b']).to_numpy().flags.f_contiguous
+    for rows in ([(2023, 2.5)], [(1, 2), (3, None)], [('A', 1)]):
+        assert numeric_matrix(rows) is None
+
+def test_mixed_numeric_rows_keep_int_columns(chart_generator):
+    """Int columns stay int when the same rows also hold floats."""
+    from frames import rows_to_dataframe
+
+    df = rows_to_dataframe([(2023, 2.5), (2024, 3.5)], ['year', 'avg_value'])
+    assert [dtype.kind for dtype in df.dtypes] == ['i', 'f']
+    fig = chart_generator.create_bar_chart([(2023, 2.5), (2024, 3.5)], ['year', 'avg_value'])
+    assert fig.data[0].x.dtype.kind == 'i'
+    assert fig.data[0].y.dtype.kind == 'f'
+
+def test_ragged_rows_are_padded(chart_generator):
+    """Short rows are padded with missing values instead of dropping cells from other rows."""
+    fig = chart_generator.create_bar_chart([('A', 1), ('B',)], ['category', 'orders'])
+    assert fig.data[0].type == 'bar'
+    assert list(fig.data[0].x) == ['A', 'B']
+
+def test_unreadable_rows_give_error_chart(chart_generator):
+    """A failure while building the DataFrame yields an error chart, not an exception."""
+    fig = chart_generator.create_bar_chart([None], ['category', 'orders'])
+    assert fig.layout.title.text == "Chart Generation Error"
+
+def test_error_chart_is_not_shared(chart_generator):
+    """Mutating one error chart leaves the next one for the same message untouched."""
+    fig = chart_generator.create_bar_chart([None], ['category', 'orders'])
+    fig.update_layout(title="Changed")
+    fig = chart_generator.create_bar_chart([None], ['category', 'orders'])
+    assert fig.layout.title.text == "Chart Generation Error"
+
+def test_heatmap_null_labels(chart_generator):
+    """NULL labels get their own heatmap row instead of overwriting another cell."""
+    fig = chart_generator.create_heatmap(
+        [('A', 'x', 1), ('B', 'y', 2), (None, 'x', 99)], ['region', 'channel', 'revenue']
+    )
+    trace = fig.data[0]
+    assert trace.type == 'heatmap'
+    assert list(trace.y[:2]) == ['A', 'B'] and pd.isna(trace.y[2])
+    assert np.isnan(trace.z[1][0]), "NULL row overwrote cell (B, x)"
+    assert trace.z[2][0] == 99
+
+def test_heatmap_repeated_cells_are_averaged(chart_generator):
+    """Repeated (row, column) pairs are averaged instead of the last one winning."""
+    fig = chart_generator.create_heatmap(
+        [('A', 'x', 1), ('A', 'x', 3), ('B', 'y', 2), ('B', 'y', None)], ['region', 'channel', 'revenue']
+    )
+    z = fig.data[0].z
+    assert z[0][0] == 2
+    assert z[1][1] == 2
+    assert np.isnan(z[0][1]) and np.isnan(z[1][0])
+
+def test_heatmap_large_values(chart_generator):
+    """Heatmap cells keep full double precision."""
+    fig = chart_generator.create_heatmap(
+        [('A', 'x', 3537547.11), ('A', 'y', 123456789.12)], ['region', 'channel', 'revenue']
+    )
+    assert fig.data[0].z[0].tolist() == [3537547.11, 123456789.12]
+
+def test_figure_json_decimal_values(chart_generator):
+    """DECIMAL results from DuckDB serialize as JSON numbers."""
+    fig = chart_generator.create_bar_chart(
+        [('A', Decimal('12.50')), ('B', Decimal('7.25'))], ['category', 'revenue']
+    )
+    # The serializer st.plotly_chart uses to ship the figure
+    spec = json.loads(pio.to_json(fig, validate=False))
+    assert spec['data'][0]['y'] == [12.5, 7.25]
+
+# Upper bound on LLM requests in flight at once, to respect provider rate limits
+MAX_CONCURRENT_LLM_CALLS = 5
+
+async def _generate_all(sql_agent, story_generator, questions):
+    """Run SQL and story generation for every question concurrently."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+
+    async def run(question):
+        async with semaphore:
+            result = await asyncio.to_thread(cached_generate_sql, sql_agent, question)
+
+            story = None
+            if result.success:
+                story = await asyncio.to_thread(
+                    cached_generate_story,
+                    story_generator,
+                    question,
+                    result.query,
+                    result.data,
+                    ['column1', 'column2']  # Simplified for test
+                )
+            return result, story
+
+    outcomes = await asyncio.gather(*(run(question) for question in questions))
+    return dict(zip(questions, outcomes))
+
+@pytest.fixture(scope="module")
+def end_to_end_results(sql_agent, story_generator):
+    """LLM results for all TEST_QUESTIONS, generated concurrently once per module."""
+    return asyncio.run(_generate_all(sql_agent, story_generator, TEST_QUESTIONS))
+
+@pytest.mark.parametrize("question", TEST_QUESTIONS, ids=lambda q: q[:40])
+def test_end_to_end_workflow(question, end_to_end_results, chart_generator):
+    """Test complete end-to-end workflow for one question."""
+    result, _story = end_to_end_results[question]
+
+    assert result.success, f"SQL generation failed: {result.error}"
+
+    # Generate chart
+    fig = chart_generator.auto_generate_chart(
+        result.data,
+        ['category', 'value'],
+        question
+    )
+    assert fig, "Chart generation failed"
+
+@pytest.mark.skipif(importlib.util.find_spec("pytest_benchmark") is None,
+                    reason="pytest-benchmark not installed")
+@pytest.mark.skipif(os.getenv("LLM_LIVE") != "1",
+                    reason="latency is only meaningful against the real model (LLM_LIVE=1)")
+def test_sql_latency(benchmark, sql_agent):
+    """Benchmark uncached SQL generation for a simple question against the real model."""
+    result = benchmark.pedantic(
+        sql_agent.generate_sql,
+        args=("What are the top 5 product categories by revenue?",),
+        rounds=3,
+        iterations=1
+    )
+    assert result.success, f"SQL generation failed: {result.error}"
+
+@pytest.mark.parametrize("question", (
+    "DELETE FROM sales_table",  # Dangerous query
+    "",  # Empty question
+    "What is the meaning of life?",  # Irrelevant question
+), ids=("dangerous", "empty", "irrelevant"))
+def test_error_handling(question, sql_agent):
+    """Invalid questions must be rejected rather than executed."""
+    result = sql_agent.generate_sql(question)
+    assert not result.success, f"Expected an error for {question!r}, got: {result.query}"
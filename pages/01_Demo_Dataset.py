@@ -7,15 +7,17 @@ import pandas as pd
 import sys
 from pathlib import Path
 
-# Add paths for custom modules
-sys.path.append(str(Path(__file__).parent.parent / "30-database"))
+# Add paths for custom modules, once: Streamlit re-executes this script on every rerun
+module_path = str(Path(__file__).parent.parent / "30-database")
+if module_path not in sys.path:
+    sys.path.append(module_path)
 
 try:
     from schema import get_schema
     from connection import test_connection
+    _IMPORTS_OK = True
 except ImportError:
-    st.error("Required modules not available. Please check your installation.")
-    st.stop()
+    _IMPORTS_OK = False
 
 st.set_page_config(
     page_title="Demo Dataset - Data Story AI",
@@ -24,79 +26,145 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Sample orders frozen by 20-config/02-freeze_demo_sample.py; the database is
+# queried instead when the snapshot is missing
+SAMPLE_SNAPSHOT = Path(__file__).parent.parent / "70-data" / "demo_sample.parquet"
+
+# Static page content, built once at import and sent as a single element per block
+INTRO_MARKDOWN = """
+# Demo Dataset Overview
+
+This page provides an overview of the sample e-commerce dataset used in 'Data Story AI'.
+"""
+
+PLAYGROUND_MARKDOWN = """
+**A Playground for Data Exploration**
+
+To help you get started, I've included this synthetic e-commerce dataset. It's designed to be a realistic playground that showcases how 'Data Story AI' can turn business questions into clear insights. While you can explore this demo data, you can also connect the tool to your own data sources.
+"""
+
+# Section heading and headline figures as one element rather than a header and four columns of st.metric
+DATASET_METRICS = (
+    ("Total Orders", "10,000"),
+    ("Unique Customers", "500"),
+    ("Product Categories", "8"),
+    ("Data Span", "Full Year 2023"),
+)
+METRICS_HTML = (
+    "## Dataset at a Glance\n\n"
+    '<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:1rem;">'
+    + "".join(
+        f'<div><div style="font-size:0.875rem;">{label}</div>'
+        f'<div style="font-size:2.25rem;line-height:1.4;">{value}</div></div>'
+        for label, value in DATASET_METRICS
+    )
+    + "</div>"
+)
+
+DETAILS_LEFT_MARKDOWN = """
+### Product Details
+Includes 8 major categories like Electronics, Clothing, and Home Goods, along with pricing and order quantities.
+
+### Transaction Information
+Contains order dates, payment methods (Credit Card, PayPal, etc.), and current order statuses.
+"""
+
+DETAILS_RIGHT_MARKDOWN = """
+### Customer Geography
+Covers a distribution of customers across several states, including California, Texas, and New York.
+
+### Sales Over Time
+The dataset spans the full year of 2023, making it ideal for analyzing seasonal and monthly trends.
+"""
+
+READY_MARKDOWN = """
+Now that you have a feel for the data, it's time to see 'Data Story AI' in action.
+
+Navigate to the **AI Chatbot** to start asking questions about this demo dataset.
+"""
+
+# Structure of sales_table, built once at import and shown as a native table
+# instead of a markdown table Streamlit would re-parse on every rerun
+SCHEMA_TABLE = pd.DataFrame(
+    [
+        ("order_id", "INTEGER", "Unique identifier for each order"),
+        ("customer_id", "INTEGER", "Unique identifier for each customer"),
+        ("order_date", "DATE", "Date the order was placed"),
+        ("product_name", "VARCHAR", "Name of the purchased product"),
+        ("product_category", "VARCHAR", "Category of the product"),
+        ("quantity_ordered", "INTEGER", "Number of items ordered"),
+        ("product_price", "DECIMAL", "Price per unit of the product"),
+        ("payment_method", "VARCHAR", "Method used for payment"),
+        ("shipping_state", "VARCHAR", "State where the order was shipped"),
+    ],
+    columns=["Column", "Type", "Description"]
+)
+
+@st.cache_resource
+def _schema():
+    """Schema helper and its DuckDB handle, shared by all reruns and sessions."""
+    return get_schema()
+
+@st.cache_data(show_spinner=False, ttl=30)
+def _database_available() -> bool:
+    """Probes the database at most once every 30 seconds, shared by all reruns."""
+    return test_connection()
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _load_sample_df(n: int = 10) -> pd.DataFrame:
+    """Fetches the sample orders once an hour instead of on every rerun."""
+    if SAMPLE_SNAPSHOT.exists():
+        snapshot = pd.read_parquet(SAMPLE_SNAPSHOT)
+        if len(snapshot) >= n:
+            return snapshot.head(n)
+    return _schema().get_sample_dataframe(n)
+
+@st.fragment
+def _render_sample_preview():
+    """Renders the sample orders table; reruns on its own, apart from the rest of the page."""
+    try:
+        df = _load_sample_df(10)
+        if not df.empty:
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.caption("A snapshot of 10 sample orders from the dataset.")
+        else:
+            # Don't cache the failure; try the database again on the next rerun
+            _load_sample_df.clear(10)
+            if _database_available():
+                st.warning("Could not load sample data.")
+            else:
+                st.error("Database connection failed. Please check your configuration.")
+    except Exception as e:
+        st.error(f"An error occurred while loading the sample data: {e}")
+
 def main():
     """Main function for the Demo Dataset page."""
-    st.title("Demo Dataset Overview")
-    st.markdown("This page provides an overview of the sample e-commerce dataset used in 'Data Story AI'.")
-
-    st.info("""
-    **A Playground for Data Exploration**
-    
-    To help you get started, I've included this synthetic e-commerce dataset. It's designed to be a realistic playground that showcases how 'Data Story AI' can turn business questions into clear insights. While you can explore this demo data, you can also connect the tool to your own data sources.
-    """)
-
-    st.header("Dataset at a Glance")
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Orders", "10,000")
-    col2.metric("Unique Customers", "500")
-    col3.metric("Product Categories", "8")
-    col4.metric("Data Span", "Full Year 2023")
+    if not _IMPORTS_OK:
+        st.error("Required modules not available. Please check your installation.")
+        st.stop()
+
+    st.markdown(INTRO_MARKDOWN)
+    st.info(PLAYGROUND_MARKDOWN)
+
+    st.markdown(METRICS_HTML, unsafe_allow_html=True)
 
     st.header("What's Inside the Data?")
     col1, col2 = st.columns(2)
     with col1:
-        st.subheader("Product Details")
-        st.write("Includes 8 major categories like Electronics, Clothing, and Home Goods, along with pricing and order quantities.")
-        
-        st.subheader("Transaction Information")
-        st.write("Contains order dates, payment methods (Credit Card, PayPal, etc.), and current order statuses.")
+        st.markdown(DETAILS_LEFT_MARKDOWN)
 
     with col2:
-        st.subheader("Customer Geography")
-        st.write("Covers a distribution of customers across several states, including California, Texas, and New York.")
-
-        st.subheader("Sales Over Time")
-        st.write("The dataset spans the full year of 2023, making it ideal for analyzing seasonal and monthly trends.")
+        st.markdown(DETAILS_RIGHT_MARKDOWN)
 
     st.header("Sample Data Preview")
-    try:
-        if test_connection():
-            schema = get_schema()
-            sample_data = schema.get_sample_data(10)
-            if sample_data:
-                df = pd.DataFrame(sample_data)
-                st.dataframe(df, use_container_width=True, hide_index=True)
-                st.caption("A snapshot of 10 sample orders from the dataset.")
-            else:
-                st.warning("Could not load sample data.")
-        else:
-            st.error("Database connection failed. Please check your configuration.")
-    except Exception as e:
-        st.error(f"An error occurred while loading the sample data: {e}")
+    _render_sample_preview()
 
     with st.expander("View the Complete Data Schema"):
-        st.markdown("""
-        Here is the structure of the `sales_table` used in this demo:
-        
-        | Column             | Type    | Description                               |
-        |--------------------|---------|-------------------------------------------|
-        | `order_id`         | INTEGER | Unique identifier for each order          |
-        | `customer_id`      | INTEGER | Unique identifier for each customer       |
-        | `order_date`       | DATE    | Date the order was placed                 |
-        | `product_name`     | VARCHAR | Name of the purchased product             |
-        | `product_category` | VARCHAR | Category of the product                   |
-        | `quantity_ordered` | INTEGER | Number of items ordered                   |
-        | `product_price`    | DECIMAL | Price per unit of the product             |
-        | `payment_method`   | VARCHAR | Method used for payment                   |
-        | `shipping_state`   | VARCHAR | State where the order was shipped         |
-        """, unsafe_allow_html=True)
+        st.markdown("Here is the structure of the `sales_table` used in this demo:")
+        st.dataframe(SCHEMA_TABLE, use_container_width=True, hide_index=True)
 
     st.header("Ready to Analyze?")
-    st.success("""
-    Now that you have a feel for the data, it's time to see 'Data Story AI' in action.
-    
-    Navigate to the **AI Chatbot** to start asking questions about this demo dataset.
-    """)
+    st.success(READY_MARKDOWN)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,22 +4,25 @@ AI Chatbot page for the Data Story AI application.
 
 import streamlit as st
 import pandas as pd
+import asyncio
+import hashlib
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Add paths for custom modules
-sys.path.append(str(Path(__file__).parent.parent / "30-database"))
-sys.path.append(str(Path(__file__).parent.parent / "40-llm"))
-sys.path.append(str(Path(__file__).parent.parent / "50-visualization"))
+# Add paths for custom modules, once: Streamlit re-executes this script on every rerun
+for module_dir in ("30-database", "40-llm", "50-visualization"):
+    module_path = str(Path(__file__).parent.parent / module_dir)
+    if module_path not in sys.path:
+        sys.path.append(module_path)
 
 try:
     from connection import test_connection
-    from sql_agent import get_sql_agent
-    from story_generator import get_story_generator
-    from plotly_charts import get_chart_generator
+    from frames import rows_to_dataframe
+    _IMPORTS_OK = True
 except ImportError:
-    st.error("Required modules not available. Please check your installation.")
-    st.stop()
+    _IMPORTS_OK = False
 
 st.set_page_config(
     page_title="AI Chatbot - Data Story AI",
@@ -28,78 +31,276 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Static page content, defined once at import rather than on every rerun
+SELECT_PROMPT = "Select a sample question"
+OTHER_QUESTION = "Other (type your own question below)"
+PREDEFINED_QUESTIONS = (
+    SELECT_PROMPT,
+    "Which states generate the most revenue?",
+    "Calculate the standard deviation of order values by product category",
+    "Show purchase frequency analysis: customers by number of orders placed",
+    "Calculate conversion metrics: orders vs cancelled/returned orders by category",
+    "Analyze payment method adoption trends over time",
+    OTHER_QUESTION
+)
+
+# Rows of the raw data table sent to the browser until the user asks for more
+RAW_DATA_PREVIEW_ROWS = 100
+
+# Seconds between checks on an analysis running in the background
+ANALYSIS_POLL_INTERVAL = 0.5
+
+# LangChain, the OpenAI client and Plotly are imported on first use rather than at
+# page load, so the page renders before any of them is needed
+
+@st.cache_resource(show_spinner=False)
+def _sql_agent():
+    """SQL agent, built once per process and reused across reruns and sessions."""
+    from sql_agent import get_sql_agent
+    return get_sql_agent()
+
+@st.cache_resource(show_spinner=False)
+def _story_generator():
+    """Story generator, built once per process and reused across reruns and sessions."""
+    from story_generator import get_story_generator
+    return get_story_generator()
+
+@st.cache_resource(show_spinner=False)
+def _chart_generator():
+    """Chart generator, built once per process and reused across reruns and sessions."""
+    from plotly_charts import get_chart_generator
+    return get_chart_generator()
+
+@st.cache_resource
+def _analysis_executor():
+    """Thread pool running analyses off the script thread, shared by all sessions."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="analysis")
+
+@st.cache_resource
+def _warm_up():
+    """
+    Builds the LLM and chart components in the background, once per process,
+    while the user is still choosing a question.
+
+    A failure is left in the returned future; the first analysis retries it.
+    """
+    return _analysis_executor().submit(lambda: (_sql_agent(), _story_generator(), _chart_generator()))
+
+@st.cache_data(show_spinner=False, ttl=30)
+def _database_available() -> bool:
+    """Probes the database at most once every 30 seconds, shared by all reruns."""
+    return test_connection()
+
+def _question_key(question: str) -> str:
+    """Lowercased, whitespace-collapsed question, so trivial rewordings share cache entries."""
+    return " ".join(question.lower().split())
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256)
+def _cached_sql(question_key: str, _question: str):
+    """Generates and runs SQL for a question, memoized per normalized question."""
+    return _sql_agent().generate_sql(_question)
+
+def _fingerprint(values: list) -> bytes:
+    """Hashes a query result list in one pass instead of element by element."""
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256, hash_funcs={list: _fingerprint})
+def _cached_story(question_key: str, query: str, data: list, columns: list,
+                  _question: str, _progress: dict = None):
+    """
+    Generates the data story for a query result, memoized per input.
+
+    While the story streams in, its executive summary so far is kept in
+    _progress['summary'] (underscore-prefixed, so it is not part of the cache key).
+    """
+    stream = _story_generator().generate_story_stream(_question, query, data, columns)
+    while True:
+        try:
+            chunk = next(stream)
+        except StopIteration as done:
+            return done.value
+        if _progress is not None:
+            _progress['summary'] += chunk
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256, hash_funcs={list: _fingerprint})
+def _cached_chart(data: list, columns: list, question: str, _df: pd.DataFrame = None):
+    """Builds the Plotly figure for a result once, reusing its DataFrame if given."""
+    return _chart_generator().auto_generate_chart(data, columns, question, df=_df)
+
 def initialize_session_state():
     """Initializes session state variables."""
     if 'current_question' not in st.session_state:
         st.session_state.current_question = ""
     if 'analysis_results' not in st.session_state:
         st.session_state.analysis_results = None
+    if 'analysis_future' not in st.session_state:
+        st.session_state.analysis_future = None
+    if 'submitted_fingerprint' not in st.session_state:
+        st.session_state.submitted_fingerprint = None
+
+async def _story_and_chart(question: str, query_result, frame, progress: dict):
+    """
+    Writes the data story and builds the chart for a query result concurrently.
+
+    Returns:
+        Tuple of (story, figure); figure is the exception if the chart failed
+    """
+    story, figure = await asyncio.gather(
+        asyncio.to_thread(
+            _cached_story,
+            _question_key(question),
+            query_result.query,
+            query_result.data,
+            query_result.columns,
+            _question=question,
+            _progress=progress
+        ),
+        asyncio.to_thread(
+            _cached_chart,
+            query_result.data,
+            query_result.columns,
+            question,
+            _df=None if isinstance(frame, Exception) else frame
+        ),
+        return_exceptions=True
+    )
+    if isinstance(story, BaseException):
+        raise story
+    if not story.success:
+        # Don't keep failures around; the next attempt should reach the model again
+        _cached_story.clear(_question_key(question), query_result.query, query_result.data,
+                            query_result.columns, question)
+    return story, figure
+
+def _run_analysis(question: str, progress: dict) -> dict:
+    """
+    Generates SQL, then the data story and chart for a question; runs on the
+    analysis executor.
+
+    Args:
+        question: Business question
+        progress: Receives the executive summary as it streams in
+
+    Returns:
+        Analysis results, or a dictionary with only 'error' if SQL generation failed
+    """
+    question_key = _question_key(question)
+    query_result = _cached_sql(question_key, question)
+
+    if not query_result.success:
+        # Don't keep failures around; the next attempt should reach the model again
+        _cached_sql.clear(question_key, question)
+        return {'error': query_result.error}
+
+    # One DataFrame serves both the chart and the raw data table
+    try:
+        frame = rows_to_dataframe(query_result.data, query_result.columns)
+    except Exception as e:
+        frame = e
+
+    story, figure = asyncio.run(_story_and_chart(question, query_result, frame, progress))
+
+    return {
+        'question': question,
+        'query': query_result.query,
+        'data': query_result.data,
+        'columns': query_result.columns,
+        'story': story,
+        'figure': figure,
+        'frame': frame
+    }
 
 def perform_analysis(question: str):
-    """Performs analysis of a business question."""
-    try:
-        sql_agent = get_sql_agent()
-        story_generator = get_story_generator()
-
-        with st.spinner("🔍 Analyzing your question..."):
-            query_result = sql_agent.generate_sql(question)
-
-        if not query_result.success:
-            st.error(f"Analysis failed: {query_result.error}")
-            return False
-
-        with st.spinner("📖 Generating your data story..."):
-            story = story_generator.generate_story(
-                question,
-                query_result.query,
-                query_result.data,
-                query_result.columns
-            )
-
-        st.session_state.analysis_results = {
-            'question': question,
-            'query': query_result.query,
-            'data': query_result.data,
-            'columns': query_result.columns,
-            'story': story
-        }
-        return True
+    """
+    Starts analysis of a business question in the background.
+
+    A repeat of the question that is already running or displayed (double
+    clicks, replayed button events) is ignored.
+    """
+    fingerprint = hashlib.blake2b(_question_key(question).encode(), digest_size=8).digest()
+    if fingerprint == st.session_state.submitted_fingerprint and (
+            st.session_state.analysis_future is not None or st.session_state.analysis_results):
+        return
+
+    st.session_state.submitted_fingerprint = fingerprint
+    st.session_state.analysis_progress = {'summary': ""}
+    st.session_state.analysis_future = _analysis_executor().submit(
+        _run_analysis, question, st.session_state.analysis_progress
+    )
+
+def collect_analysis() -> bool:
+    """
+    Stores the results of a finished background analysis.
 
+    While the analysis is still running, shows the executive summary streamed so
+    far under a spinner, then reruns the page, so the UI stays responsive and the
+    summary grows between checks.
+
+    Returns:
+        True if new results were stored, False otherwise
+    """
+    future = st.session_state.analysis_future
+    if future is None:
+        return False
+
+    if not future.done():
+        summary = st.session_state.analysis_progress['summary']
+        if summary:
+            st.info(f"**Executive Summary:** {summary}▌")
+        with st.spinner("🔍 Analyzing your question and writing your data story..."):
+            time.sleep(ANALYSIS_POLL_INTERVAL)
+        st.rerun()
+
+    st.session_state.analysis_future = None
+    try:
+        results = future.result()
     except Exception as e:
+        st.session_state.submitted_fingerprint = None
         st.error(f"An error occurred during analysis: {e}")
         return False
 
+    if 'error' in results:
+        # Allow the same question to be retried
+        st.session_state.submitted_fingerprint = None
+        st.error(f"Analysis failed: {results['error']}")
+        return False
+
+    st.session_state.analysis_results = results
+    return True
+
+@st.fragment
 def display_analysis_results():
-    """Displays the analysis results in a structured format."""
+    """
+    Displays the analysis results in a structured format.
+
+    Runs as a fragment, so widgets inside it (the raw data row count) rerun only
+    this function instead of the whole page.
+    """
     if not st.session_state.analysis_results:
         return
 
     results = st.session_state.analysis_results
     story = results['story']
     data = results['data']
-    columns = results['columns']
 
     st.header(f"Data Story for: "f"'{results['question']}'")
     st.info(f"**Executive Summary:** {story.executive_summary}")
 
     st.subheader("📊 Data Visualization")
-    try:
-        chart_generator = get_chart_generator()
-        fig = chart_generator.auto_generate_chart(data, columns, results['question'])
-        st.plotly_chart(fig, use_container_width=True)
-    except Exception as e:
-        st.warning(f"Could not generate a visualization for this data. {e}")
+    figure = results['figure']
+    if isinstance(figure, Exception):
+        st.warning(f"Could not generate a visualization for this data. {figure}")
+    else:
+        st.plotly_chart(figure, use_container_width=True, config=_chart_generator().chart_config)
 
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("💡 Key Insights")
-        for insight in story.key_insights:
-            st.markdown(f"- {insight}")
+        st.markdown("\n".join(f"- {insight}" for insight in story.key_insights))
 
     with col2:
         st.subheader("🎯 Recommendations")
-        for rec in story.recommendations:
-            st.markdown(f"- {rec}")
+        st.markdown("\n".join(f"- {rec}" for rec in story.recommendations))
 
     with st.expander("Explore the Detailed Analysis, Raw Data, and SQL Query"):
         st.subheader("📝 Detailed Analysis")
@@ -107,23 +308,37 @@ def display_analysis_results():
 
         st.subheader("Raw Data Table")
         if data:
-            # Handle column mismatch gracefully
             try:
-                if len(data) > 0:
-                    actual_cols = len(data[0])
-                    if len(columns) != actual_cols:
-                        if len(columns) < actual_cols:
-                            columns = columns + [f'col_{i}' for i in range(len(columns), actual_cols)]
-                        elif len(columns) > actual_cols:
-                            columns = columns[:actual_cols]
-
-                df = pd.DataFrame(data, columns=columns)
-                st.dataframe(df, use_container_width=True)
+                df = results['frame']
+                if isinstance(df, Exception):
+                    raise df
+                if len(df) > RAW_DATA_PREVIEW_ROWS:
+                    rows_shown = st.number_input(
+                        "Rows to show",
+                        min_value=RAW_DATA_PREVIEW_ROWS,
+                        max_value=len(df),
+                        value=RAW_DATA_PREVIEW_ROWS,
+                        step=RAW_DATA_PREVIEW_ROWS,
+                        key="raw_data_rows"
+                    )
+                    st.dataframe(df.head(rows_shown), use_container_width=True)
+                    st.caption(f"Showing {min(rows_shown, len(df))} of {len(df)} rows.")
+                else:
+                    st.dataframe(df, use_container_width=True)
+                # The CSV is only built when the button is clicked, and clicking doesn't rerun the page
+                st.download_button(
+                    "Download full results as CSV",
+                    data=lambda: df.to_csv(index=False),
+                    file_name="data_story_results.csv",
+                    mime="text/csv",
+                    on_click="ignore"
+                )
             except Exception as e:
                 st.warning(f"Could not display raw data table: {e}")
-                st.text("Raw data:")
-                for i, row in enumerate(data[:10]):  # Show first 10 rows as text
-                    st.text(f"Row {i+1}: {row}")
+                # Show first 10 rows as text, in one element
+                st.text("Raw data:\n" + "\n".join(
+                    f"Row {i+1}: {row}" for i, row in enumerate(data[:10])
+                ))
 
         st.subheader("Generated SQL Query")
         st.code(results['query'], language='sql')
@@ -132,39 +347,37 @@ def display_analysis_results():
 
 def main():
     """Main function for the AI Chatbot page."""
+    if not _IMPORTS_OK:
+        st.error("Required modules not available. Please check your installation.")
+        st.stop()
+
     initialize_session_state()
 
     st.title("'Data Story AI' Chatbot")
     st.markdown("Ask a question about the demo e-commerce data to generate an instant data story.")
 
-    if not test_connection():
+    if not _database_available():
         st.error("Database connection failed. Please ensure your database is running and configured correctly.")
+        # The failed probe is cached for 30 seconds; let the user retry sooner
+        st.button("Retry connection", on_click=_database_available.clear)
         return
 
-    predefined_questions = [
-        "Select a sample question",
-        "Which states generate the most revenue?",
-        "Calculate the standard deviation of order values by product category",
-        "Show purchase frequency analysis: customers by number of orders placed",
-        "Calculate conversion metrics: orders vs cancelled/returned orders by category",
-        "Analyze payment method adoption trends over time",
-        "Other (type your own question below)"
-    ]
+    _warm_up()
 
     selected_question = st.selectbox(
         "Start with a sample question or select 'Other' to ask your own:",
-        predefined_questions,
+        PREDEFINED_QUESTIONS,
         index=0,
         key="question_selector"
     )
 
-    if selected_question == "Other (type your own question below)":
+    if selected_question == OTHER_QUESTION:
         current_question = st.text_input(
             "Enter your question here:",
             key="custom_question_input",
             placeholder="e.g., What are the most profitable products?"
         )
-    elif selected_question != "Select a sample question":
+    elif selected_question != SELECT_PROMPT:
         current_question = selected_question
     else:
         current_question = ""
@@ -172,13 +385,13 @@ def main():
     if st.button("Generate Data Story", disabled=not current_question, use_container_width=True):
         if current_question:
             st.session_state.current_question = current_question
-            if perform_analysis(current_question):
-                st.success("Your data story is ready!")
-                # This rerun is to ensure the display function is called immediately after analysis
-                st.rerun()
+            perform_analysis(current_question)
         else:
             st.warning("Please select or enter a question first.")
 
+    if collect_analysis():
+        st.success("Your data story is ready!")
+
     if st.session_state.analysis_results:
         display_analysis_results()
     else:
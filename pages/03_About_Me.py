@@ -11,58 +11,55 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def main():
-    """Main function for the About Me page."""
-    st.title("About Me")
-
-    st.markdown("""
-    ## Hi, I'm Kunal!
+# Static page content, built once at import and sent as a single element
+ABOUT_MARKDOWN = """
+# About Me
 
-    I'm a passionate developer and data enthusiast who built 'Data Story AI' to bridge the gap between complex data and actionable business insights.
+## Hi, I'm Kunal!
 
-    With a background in software engineering and a deep interest in artificial intelligence, I believe that powerful analytics should be accessible to everyone, not just technical experts.
+I'm a passionate developer and data enthusiast who built 'Data Story AI' to bridge the gap between complex data and actionable business insights.
 
-    ### Why I Built This Tool
+With a background in software engineering and a deep interest in artificial intelligence, I believe that powerful analytics should be accessible to everyone, not just technical experts.
 
-    Throughout my career, I've seen countless organizations struggle with the same challenge: they have valuable data, but turning it into meaningful stories and actionable insights requires either technical expertise or long waits for analyst availability.
+### Why I Built This Tool
 
-    I built 'Data Story AI' to democratize data analysis and enable anyone to have natural conversations with their data.
-    """)
+Throughout my career, I've seen countless organizations struggle with the same challenge: they have valuable data, but turning it into meaningful stories and actionable insights requires either technical expertise or long waits for analyst availability.
 
-    st.header("Connect & Explore")
+I built 'Data Story AI' to democratize data analysis and enable anyone to have natural conversations with their data.
 
-    st.markdown("""
+## Connect & Explore
 
-    ### Personal Links
-    - [My Portfolio Website](https://www.kunal-pathak.com)
-    - [My Professional Profile](https://www.linkedin.com/in/kunal-pathak-profile/)
-    - [My Open Source Contributions](https://github.com/kanad13)
+### Personal Links
+- [My Portfolio Website](https://www.kunal-pathak.com)
+- [My Professional Profile](https://www.linkedin.com/in/kunal-pathak-profile/)
+- [My Open Source Contributions](https://github.com/kanad13)
 
-    ### Project Resources
-    - [View Source Code](https://github.com/kanad13/Data-Story-AI) for Data Story AI
-    """)
+### Project Resources
+- [View Source Code](https://github.com/kanad13/Data-Story-AI) for Data Story AI
 
+## Acknowledgments
 
-    st.header("Acknowledgments")
+This project wouldn't be possible without the incredible open-source community. Special thanks to:
 
-    st.markdown("""
-    This project wouldn't be possible without the incredible open-source community. Special thanks to:
+### Core Technologies
+- **[Streamlit](https://streamlit.io/)** - For the beautiful and intuitive web framework
+- **[DuckDB](https://duckdb.org/)** - For the lightning-fast analytical database
+- **[LangChain](https://python.langchain.com/)** - For the powerful LLM orchestration framework
+- **[Plotly](https://plotly.com/python/)** - For the interactive visualization capabilities
 
-    ### Core Technologies
-    - **[Streamlit](https://streamlit.io/)** - For the beautiful and intuitive web framework
-    - **[DuckDB](https://duckdb.org/)** - For the lightning-fast analytical database
-    - **[LangChain](https://python.langchain.com/)** - For the powerful LLM orchestration framework
-    - **[Plotly](https://plotly.com/python/)** - For the interactive visualization capabilities
+### AI & Machine Learning
+- **[Pandas](https://pandas.pydata.org/)** - For data manipulation and analysis
+- **[NumPy](https://numpy.org/)** - For numerical computing foundations
 
-    ### AI & Machine Learning
-    - **[Pandas](https://pandas.pydata.org/)** - For data manipulation and analysis
-    - **[NumPy](https://numpy.org/)** - For numerical computing foundations
+### Development Tools
+- **[Python](https://python.org/)** - The language that makes it all possible
+- **[SQLParse](https://github.com/andialbrecht/sqlparse)** - For SQL query parsing and validation
+- **[Python-dotenv](https://github.com/theskumar/python-dotenv)** - For environment configuration management
+"""
 
-    ### Development Tools
-    - **[Python](https://python.org/)** - The language that makes it all possible
-    - **[SQLParse](https://github.com/andialbrecht/sqlparse)** - For SQL query parsing and validation
-    - **[Python-dotenv](https://github.com/theskumar/python-dotenv)** - For environment configuration management
-    """)
+def main():
+    """Main function for the About Me page."""
+    st.markdown(ABOUT_MARKDOWN)
 
 
 if __name__ == "__main__":